@@ -1,14 +1,32 @@
 # app/api/trainer_attendance.py
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime, timezone, timedelta
 
-from app.db.database import get_db
+from app.core.config import ATTENDANCE_STREAM_HEARTBEAT_SECONDS, FAST_LIST_RESPONSES, READ_COALESCE_CACHE_SECONDS
+from app.core.events import attendance_events, format_sse
+from app.db.database import get_db, SessionLocal
 from app.models.T_attendance import TrainerAttendance
 from app.models.user import User
 from app.api.deps import require_roles
-from app.schemas.T_attendance import TrainerAttendanceCreate, TrainerAttendanceOut
+from app.schemas.T_attendance import (
+    TrainerAttendanceCreate,
+    TrainerAttendanceOut,
+    TrainerAttendancePage,
+    CoverageHeatmapOut,
+    BatchAttendanceRequest,
+    BatchAttendanceOut,
+)
+from app.utils.pagination import keyset_page
+from app.utils.attendance import publish_attendance_event
+from app.utils.coverage import coverage_heatmap
+from app.utils.coalesce import coalesce
+from app.utils.fast_json import FastJSONResponse, schema_columns, rows_to_dicts
 
 security = HTTPBearer()
 router = APIRouter(prefix="/trainer-attendance", tags=["trainer-attendance"],dependencies=[Depends(security)])
@@ -66,6 +84,7 @@ def checkin(payload: TrainerAttendanceCreate, current_user = Depends(require_rol
     db.add(attendance)
     db.commit()
     db.refresh(attendance)
+    publish_attendance_event(attendance)
     return attendance
 
 
@@ -106,37 +125,131 @@ def checkout(payload: TrainerAttendanceCreate, current_user = Depends(require_ro
     open_session.check_out = now
     db.commit()
     db.refresh(open_session)
+    publish_attendance_event(open_session)
     return open_session
 
 
+# ------------------ BATCH (KIOSK) ------------------
+@router.post("/batch", response_model=BatchAttendanceOut,
+             dependencies=[Depends(require_roles(["receptionist", "admin"]))])
+def batch_attendance(payload: BatchAttendanceRequest, db: Session = Depends(get_db)):
+    """
+    Check several trainers in and/or out at once (shift change at reception).
+    Receptionist/admin only.
+
+    Entries are applied in order, so the same trainer may appear twice
+    (e.g. checkout then checkin). Invalid entries are reported per entry and
+    skipped; all valid transitions are committed together in one transaction.
+    """
+    trainer_ids = {e.trainer_id for e in payload.entries}
+
+    # one query to validate every trainer
+    users = {u.id: u for u in db.query(User).filter(User.id.in_(trainer_ids)).all()}
+
+    # one query for every open session; keep the latest one per trainer like checkout does
+    open_sessions = {}
+    for session in db.query(TrainerAttendance).filter(
+        TrainerAttendance.trainer_id.in_(trainer_ids),
+        TrainerAttendance.check_out.is_(None)
+    ).order_by(TrainerAttendance.check_in.asc()).all():
+        open_sessions[session.trainer_id] = session
+
+    now = datetime.now(timezone.utc)
+    results = []
+    touched = []
+    for entry in payload.entries:
+        result = {"trainer_id": entry.trainer_id, "action": entry.action, "success": False}
+        results.append(result)
+
+        user = users.get(entry.trainer_id)
+        if not user:
+            result["detail"] = "Trainer user not found"
+            continue
+        if getattr(user, "role", None) != "trainer":
+            result["detail"] = "User is not a trainer"
+            continue
+
+        open_session = open_sessions.get(entry.trainer_id)
+        if entry.action == "checkin":
+            if open_session:
+                result["detail"] = "Trainer already has an open session (checked in but not checked out)"
+                continue
+            attendance = TrainerAttendance(trainer_id=entry.trainer_id, check_in=now, created_at=now)
+            db.add(attendance)
+            open_sessions[entry.trainer_id] = attendance
+        else:
+            if not open_session:
+                result["detail"] = "No open session found for trainer"
+                continue
+            open_session.check_out = now
+            attendance = open_session
+            open_sessions.pop(entry.trainer_id)
+
+        result["success"] = True
+        # a later entry may close this same row; keep its state as of this entry
+        touched.append((result, attendance, attendance.check_out))
+
+    if touched:
+        # serialize after flush (ids assigned) but before commit expires the rows,
+        # so building the response doesn't re-select every row
+        db.flush()
+        for result, attendance, check_out in touched:
+            result["attendance"] = TrainerAttendanceOut.model_validate(attendance).model_copy(
+                update={"check_out": check_out}
+            )
+        db.commit()
+        # one event per entry: a check-in and checkout of the same row in
+        # one batch publish "checkin:<id>" then "checkout:<id>"
+        for result, _, _ in touched:
+            publish_attendance_event(result["attendance"])
+
+    return {"results": results}
+
+
 # ------------------ LIST / QUERY ------------------
-@router.get("/", response_model=list[TrainerAttendanceOut],
+@router.get("/", response_model=TrainerAttendancePage,
             dependencies=[Depends(require_roles(["admin", "receptionist"]))])
-def list_attendance(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def list_attendance(cursor: str | None = None, limit: int = Query(100, ge=1, le=500),
+                    db: Session = Depends(get_db)):
     """
-    List trainer attendance records. Admin/Receptionist only.
+    List trainer attendance records, newest first. Admin/Receptionist only.
+    Pass the returned next_cursor back as ?cursor= to get the next page.
     """
-    rows = db.query(TrainerAttendance).order_by(TrainerAttendance.check_in.desc()).offset(skip).limit(limit).all()
-    return rows
+    if FAST_LIST_RESPONSES:
+        columns = schema_columns(TrainerAttendance, TrainerAttendanceOut)
+        rows, next_cursor = keyset_page(
+            db.query(*columns), TrainerAttendance.check_in, TrainerAttendance.id, cursor, limit
+        )
+        return FastJSONResponse({
+            "items": rows_to_dicts(rows, [c.key for c in columns]),
+            "next_cursor": next_cursor,
+        })
+
+    rows, next_cursor = keyset_page(
+        db.query(TrainerAttendance), TrainerAttendance.check_in, TrainerAttendance.id, cursor, limit
+    )
+    return {"items": rows, "next_cursor": next_cursor}
 
 
-@router.get("/me", response_model=list[TrainerAttendanceOut],
+@router.get("/me", response_model=TrainerAttendancePage,
             dependencies=[Depends(require_roles(["admin", "trainer"]))])
-def my_attendance(current_user = Depends(require_roles(["trainer"])), db: Session = Depends(get_db)):
+def my_attendance(cursor: str | None = None, limit: int = Query(100, ge=1, le=500),
+                  current_user = Depends(require_roles(["trainer"])), db: Session = Depends(get_db)):
     """
-    Trainer can view their own attendance history.
+    Trainer can view their own attendance history, newest first (paginated).
     """
-    rows = db.query(TrainerAttendance).filter(TrainerAttendance.trainer_id == current_user.id).order_by(TrainerAttendance.check_in.desc()).all()
-    return rows
+    query = db.query(TrainerAttendance).filter(TrainerAttendance.trainer_id == current_user.id)
+    rows, next_cursor = keyset_page(query, TrainerAttendance.check_in, TrainerAttendance.id, cursor, limit)
+    return {"items": rows, "next_cursor": next_cursor}
 
 
 @router.get("/today", response_model=list[TrainerAttendanceOut],
             dependencies=[Depends(require_roles(["admin", "receptionist"]))])
+@coalesce(list[TrainerAttendanceOut], ttl=READ_COALESCE_CACHE_SECONDS)
 def today_attendance(db: Session = Depends(get_db)):
     """
     Get today's attendance records (UTC day). Admin/Receptionist only.
     """
-    from datetime import datetime, timezone, timedelta, date
     now = datetime.now(timezone.utc)
     start_of_day = datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
     rows = db.query(TrainerAttendance).filter(
@@ -146,19 +259,75 @@ def today_attendance(db: Session = Depends(get_db)):
 
 from datetime import datetime, date, timezone
 
+
+def _today_snapshot() -> list[dict]:
+    """Today's attendance rows (UTC day), already JSON-ready."""
+    now = datetime.now(timezone.utc)
+    start_of_day = datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
+    db = SessionLocal()
+    try:
+        rows = db.query(TrainerAttendance).filter(
+            TrainerAttendance.check_in >= start_of_day
+        ).order_by(TrainerAttendance.check_in.desc()).all()
+        return [TrainerAttendanceOut.model_validate(r).model_dump(mode="json") for r in rows]
+    finally:
+        db.close()
+
+
+@router.get("/stream", dependencies=[Depends(require_roles(["admin", "receptionist"]))])
+async def attendance_stream():
+    """
+    Live attendance board (Server-Sent Events). Admin/Receptionist only.
+
+    Sends a `snapshot` event with today's records on connect, then a
+    `checkin` / `checkout` event for every change. Replaces polling /today.
+    """
+    # subscribe before taking the snapshot so no change falls in between
+    queue = attendance_events.subscribe()
+    try:
+        snapshot = await run_in_threadpool(_today_snapshot)
+    except Exception:
+        attendance_events.unsubscribe(queue)
+        raise
+
+    async def event_generator():
+        try:
+            yield format_sse("snapshot", snapshot)
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=ATTENDANCE_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # SSE comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            attendance_events.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/by-trainer",
-    response_model=list[TrainerAttendanceOut],
+    response_model=TrainerAttendancePage,
     dependencies=[Depends(require_roles(["admin", "receptionist"]))],
 )
 def get_attendance_by_trainer(
     trainer_id: int,
     start_date: date,
     end_date: date,
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db),
 ):
     """
-    Get attendance of a specific trainer within a date range.
+    Get attendance of a specific trainer within a date range, oldest first.
     Useful for monthly, weekly, or payroll attendance.
     """
 
@@ -166,15 +335,56 @@ def get_attendance_by_trainer(
     start_dt = datetime.combine(start_date, datetime.min.time(), tzinfo=timezone.utc)
     end_dt = datetime.combine(end_date, datetime.max.time(), tzinfo=timezone.utc)
 
-    rows = (
-        db.query(TrainerAttendance)
-        .filter(
-            TrainerAttendance.trainer_id == trainer_id,
-            TrainerAttendance.check_in >= start_dt,
-            TrainerAttendance.check_in <= end_dt,
-        )
-        .order_by(TrainerAttendance.check_in.asc())
-        .all()
+    query = db.query(TrainerAttendance).filter(
+        TrainerAttendance.trainer_id == trainer_id,
+        TrainerAttendance.check_in >= start_dt,
+        TrainerAttendance.check_in <= end_dt,
+    )
+    rows, next_cursor = keyset_page(
+        query, TrainerAttendance.check_in, TrainerAttendance.id, cursor, limit, descending=False
     )
 
-    return rows
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+MAX_COVERAGE_DAYS = 400
+
+
+@router.get(
+    "/coverage",
+    response_model=CoverageHeatmapOut,
+    dependencies=[Depends(require_roles(["admin", "receptionist"]))],
+)
+def get_coverage_heatmap(
+    start_date: date,
+    end_date: date,
+    db: Session = Depends(get_db),
+):
+    """
+    Hour-of-week staffing heatmap: average number of trainers on the floor
+    for each weekday x hour (UTC) between start_date and end_date inclusive.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+    if (end_date - start_date).days >= MAX_COVERAGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_COVERAGE_DAYS} days")
+
+    start_dt = datetime.combine(start_date, datetime.min.time(), tzinfo=timezone.utc)
+    end_dt = datetime.combine(end_date + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+
+    # column-only query: no ORM objects are built for the intervals
+    rows = db.query(TrainerAttendance.check_in, TrainerAttendance.check_out).filter(
+        TrainerAttendance.check_in < end_dt,
+        or_(TrainerAttendance.check_out.is_(None), TrainerAttendance.check_out > start_dt),
+    ).all()
+    check_ins = [r[0] for r in rows]
+    check_outs = [r[1] for r in rows]
+
+    matrix = coverage_heatmap(check_ins, check_outs, start_dt, end_dt)
+
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "days": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+        "matrix": matrix.round(3).tolist(),
+    }
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.db.database import get_db, replicas
 from app.models.user import User, role, status as user_status
 from app.api.deps import require_roles
+from app.utils.coalesce import coalescing_stats
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -54,3 +55,19 @@ def reject_user(user_id: int, db: Session = Depends(get_db)):
     db.delete(user)
     db.commit()
     return {"message": f"User {user.name} rejected successfully!"}
+
+
+# request coalescing counters for this worker process
+@router.get("/metrics/coalescing", dependencies=[Depends(require_roles(["admin"]))])
+def get_coalescing_metrics():
+    """
+    Per endpoint: requests, executions (database work actually done),
+    coalesced (joined a running computation), cache_hits, bypassed and errors.
+    """
+    return coalescing_stats()
+
+
+# read replica health as last seen by this worker's health check
+@router.get("/metrics/replicas", dependencies=[Depends(require_roles(["admin"]))])
+def get_replica_metrics():
+    return replicas.status()
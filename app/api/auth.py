@@ -45,7 +45,7 @@ def login(payload: LoginIn, db: Session = Depends(get_db)):
     return {"access_token": token, "token_type": "bearer"}
 
 @router.get("/me")
-def get_current_user(current_user: User = Depends(get_current_user)):
+async def get_current_user(current_user: User = Depends(get_current_user)):
     return {
         "id": current_user.id,
         "name": current_user.name,
@@ -0,0 +1,106 @@
+"""
+Admin dashboard counters in one request.
+
+GET /dashboard/summary replaces fetching every member, trainer, query and
+attendance list just to show their lengths. Four aggregate queries run
+concurrently, each on its own connection (spread over the read replicas
+when there are any). The result is cached for
+DASHBOARD_CACHE_SECONDS, and a refresh is single-flight: while it runs,
+other requests await the same computation instead of starting their own
+(app/utils/coalesce.py).
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends
+from fastapi.security import HTTPBearer
+from sqlalchemy import case, func
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import require_roles
+from app.core.config import DASHBOARD_CACHE_SECONDS
+from app.db.database import read_session
+from app.models.members import Member
+from app.models.member_memberships import MemberMembership
+from app.models.membership_plans import MembershipPlan
+from app.models.query import Query
+from app.models.T_attendance import TrainerAttendance
+from app.schemas.dashboard import DashboardSummary
+from app.utils.coalesce import SingleFlight
+
+security = HTTPBearer()
+router = APIRouter(prefix="/dashboard", tags=["dashboard"], dependencies=[Depends(security)])
+
+# same window as /fitness-checkups/due
+CHECKUP_DUE_SOON_DAYS = 2
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _member_counts(today: date) -> dict:
+    # one pass over members for all four counters
+    with read_session() as db:
+        total, active, due_today, due_soon = db.query(
+            func.count(Member.id),
+            _count_if(Member.membership_end >= today),
+            _count_if(Member.next_fitness_checkup_date <= today),
+            _count_if(Member.next_fitness_checkup_date.between(
+                today + timedelta(days=1), today + timedelta(days=CHECKUP_DUE_SOON_DAYS))),
+        ).one()
+    return {"total_members": total, "active_members": active,
+            "checkups_due_today": due_today, "checkups_due_soon": due_soon}
+
+
+def _trainers_on_floor() -> dict:
+    with read_session() as db:
+        count = db.query(func.count(func.distinct(TrainerAttendance.trainer_id))).filter(
+            TrainerAttendance.check_out.is_(None)
+        ).scalar()
+    return {"trainers_on_floor": count}
+
+
+def _lead_counts(week_start: datetime) -> dict:
+    with read_session() as db:
+        rows = db.query(Query.status, func.count(Query.id), _count_if(Query.created_at >= week_start)).group_by(
+            Query.status
+        ).all()
+    return {
+        "leads_by_status": {status or "unknown": count for status, count, _ in rows},
+        "new_leads_this_week": sum(new for _, _, new in rows),
+    }
+
+
+def _revenue(week_start: datetime) -> dict:
+    with read_session() as db:
+        total = db.query(func.coalesce(func.sum(MembershipPlan.final_price), 0)).join(
+            MemberMembership, MemberMembership.plan_id == MembershipPlan.id
+        ).filter(MemberMembership.created_at >= week_start).scalar()
+    return {"revenue_this_week": float(total)}
+
+
+async def compute_summary() -> dict:
+    today = date.today()
+    week_start = datetime.combine(today - timedelta(days=today.weekday()), datetime.min.time())
+    parts = await asyncio.gather(
+        run_in_threadpool(_member_counts, today),
+        run_in_threadpool(_trainers_on_floor),
+        run_in_threadpool(_lead_counts, week_start),
+        run_in_threadpool(_revenue, week_start),
+    )
+    summary = {"generated_at": datetime.now(timezone.utc)}
+    for part in parts:
+        summary.update(part)
+    return summary
+
+
+_summary = SingleFlight("dashboard.summary", ttl=DASHBOARD_CACHE_SECONDS, max_entries=1)
+
+
+@router.get("/summary", response_model=DashboardSummary,
+            dependencies=[Depends(require_roles(["admin", "receptionist"]))])
+async def get_dashboard_summary():
+    """Member, checkup, trainer, lead and revenue counters for the dashboard."""
+    return await _summary.do("summary", compute_summary)
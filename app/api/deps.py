@@ -10,10 +10,7 @@ from app.auth.jwt_handler import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_db_dep():
-    yield from get_db()
-
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db_dep)) -> User:
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     payload = decode_access_token(token)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
@@ -29,10 +26,16 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     if getattr(user, "status", None) != "approved":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account pending approval")
 
+    # Return the connection to the pool now rather than at the end of the
+    # request: requests awaiting a coalesced read or the dashboard summary
+    # would otherwise pin the whole pool. The user's columns stay loaded.
+    db.expunge(user)
+    db.rollback()
     return user
 
 def require_roles(allowed_roles: List[str]):
-    def role_checker(current_user: User = Depends(get_current_user)):
+    # no I/O: run on the event loop instead of a threadpool hop
+    async def role_checker(current_user: User = Depends(get_current_user)):
         if current_user.role not in allowed_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return current_user
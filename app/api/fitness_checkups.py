@@ -15,6 +15,8 @@ from app.db.database import get_db
 from app.models.members import Member
 from app.schemas.members import MemberOut
 from app.api.deps import require_roles
+from app.core.config import READ_COALESCE_CACHE_SECONDS
+from app.utils.coalesce import coalesce
 from app.utils.fitness_checkup import (
     calculate_next_fitness_checkup_date,
     is_checkup_due_soon,
@@ -34,6 +36,7 @@ router = APIRouter(
     response_model=List[MemberOut],
     dependencies=[Depends(require_roles(["admin", "receptionist"]))],
 )
+@coalesce(List[MemberOut], ttl=READ_COALESCE_CACHE_SECONDS)
 def get_members_with_due_checkups(db: Session = Depends(get_db)):
     """
     Get all members whose fitness checkup is due within the next 2 days.
@@ -54,8 +57,7 @@ def get_members_with_due_checkups(db: Session = Depends(get_db)):
         db.query(Member)
         .filter(
             Member.next_fitness_checkup_date.isnot(None),
-            Member.next_fitness_checkup_date <= today + \
-            _timedelta_like(days=2),
+            Member.next_fitness_checkup_date <= _timedelta_like(days=2),
         )
         .order_by(Member.next_fitness_checkup_date.asc())
         .all()
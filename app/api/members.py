@@ -60,18 +60,38 @@
 #     db.commit()
 #     return {"message": "Member deleted"}
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.models.members import Member
-from app.schemas.members import MemberCreate, MemberUpdate, MemberOut
+from sqlalchemy.orm.exc import StaleDataError
+from app.db.database import get_db, get_primary_db
+from app.models.members import Member, MemberTombstone
+from app.schemas.members import (
+    MemberCreate, MemberUpdate, MemberOut, MemberChangesOut,
+    MemberBulkSelection, MemberBulkUpdate, MemberBulkResult,
+)
 from app.api.deps import require_roles
+from app.core.config import (
+    FAST_LIST_RESPONSES, IMAGE_FORMAT, IMAGE_QUALITY, IMAGE_WORKERS, MAX_IMAGE_UPLOAD_BYTES,
+    READ_COALESCE_CACHE_SECONDS,
+)
 from app.utils.fitness_checkup import calculate_next_fitness_checkup_date
+from app.utils.coalesce import coalesce
+from app.utils.fast_json import FastJSONResponse, schema_columns, rows_to_dicts
+from app.utils.etag import check_if_match, make_etag, not_modified, not_modified_response
+from app.utils.member_search import member_search_index
+from app.utils.images import VARIANT_SIZES, get_image_pool, process_image, variant_urls
+from app.utils.uploads import receive_upload
+from app.storage import acquire, content_key, get_storage, purge, release
 from fastapi.security import HTTPBearer
+from PIL import Image, UnidentifiedImageError
 import os
+import tempfile
 from pathlib import Path
-from fastapi import UploadFile, File
-import shutil
+from fastapi import BackgroundTasks, UploadFile, File
 
 security = HTTPBearer()
 router = APIRouter(prefix="/members", tags=["members"],dependencies=[Depends(security)])
@@ -99,13 +119,18 @@ def create_member(member: MemberCreate, db: Session = Depends(get_db)):
     db.add(new_member)
     db.commit()
     db.refresh(new_member)
+    member_search_index.upsert(new_member.id, new_member.name, new_member.phone)
     return new_member
 
 
 # -------------------- GET ALL MEMBERS --------------------
 @router.get("/", response_model=list[MemberOut],
             dependencies=[Depends(require_roles(["admin", "receptionist"]))])
+@coalesce(list[MemberOut], ttl=READ_COALESCE_CACHE_SECONDS)
 def get_members(db: Session = Depends(get_db)):
+    if FAST_LIST_RESPONSES:
+        return _get_members_fast(db)
+
     members = db.query(Member).all()
     
     # Calculate next_fitness_checkup_date for all members (for display purposes)
@@ -122,106 +147,338 @@ def get_members(db: Session = Depends(get_db)):
     return members
 
 
+def _get_members_fast(db: Session):
+    """get_members without ORM objects or pydantic re-validation."""
+    columns = schema_columns(Member, MemberOut)
+    members = rows_to_dicts(db.query(*columns).all(), [c.key for c in columns])
+    for member in members:
+        member["image_variants"] = variant_urls(member["image_url"])
+        if member["next_fitness_checkup_date"] is None:
+            member["next_fitness_checkup_date"] = calculate_next_fitness_checkup_date(
+                membership_start=member["membership_start"],
+                created_at=member["created_at"],
+                last_checkup_date=member["last_fitness_checkup_date"],
+                checkpoint_interval_days=21,
+            )
+    return FastJSONResponse(members)
+
+
+# -------------------- MEMBER CHANGES (DELTA SYNC) --------------------
+# timestamps are second precision on MySQL DATETIME / SQLite CURRENT_TIMESTAMP,
+# so re-send anything from the watermark's second; clients upsert by id anyway
+SYNC_OVERLAP = timedelta(seconds=1)
+
+
+@router.get("/changes", response_model=MemberChangesOut,
+            dependencies=[Depends(require_roles(["admin", "receptionist"]))])
+def get_member_changes(
+    since: Optional[datetime] = Query(None, description="watermark from the previous call; omit for a full download"),
+    # a lagging replica would hand out a watermark past rows it hasn't received yet
+    db: Session = Depends(get_primary_db),
+):
+    """
+    Members changed and deleted since `since`, plus the watermark to send
+    next time. Lets reception tablets keep a local roster in sync without
+    re-downloading GET /members.
+    """
+    # database clock, so the watermark is comparable with updated_at / deleted_at
+    watermark = db.scalar(select(func.now()))
+
+    members_query = db.query(Member)
+    deleted = []
+    if since is not None:
+        since = since - SYNC_OVERLAP
+        members_query = members_query.filter(Member.updated_at >= since)
+        deleted = [
+            {"id": member_id, "deleted_at": deleted_at}
+            for member_id, deleted_at in db.query(MemberTombstone.member_id, MemberTombstone.deleted_at).filter(
+                MemberTombstone.deleted_at >= since
+            ).all()
+        ]
+
+    members = members_query.order_by(Member.updated_at.asc(), Member.id.asc()).all()
+    for member in members:
+        if member.next_fitness_checkup_date is None:
+            member.next_fitness_checkup_date = _next_checkup_date(member)
+
+    return {"watermark": watermark, "members": members, "deleted": deleted}
+
+
+# -------------------- SEARCH MEMBERS --------------------
+@router.get("/search", response_model=list[MemberOut],
+            dependencies=[Depends(require_roles(["admin", "receptionist"]))])
+def search_members(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """
+    Typeahead search by name (any word prefix, case and accent insensitive)
+    or phone number (leading or trailing digits). Best matches first.
+    """
+    member_search_index.refresh(db)
+    ids = member_search_index.search(q, limit)
+    if not ids:
+        return []
+
+    by_id = {m.id: m for m in db.query(Member).filter(Member.id.in_(ids)).all()}
+    members = [by_id[member_id] for member_id in ids if member_id in by_id]
+    for member in members:
+        if member.next_fitness_checkup_date is None:
+            member.next_fitness_checkup_date = _next_checkup_date(member)
+    return members
+
+
+# -------------------- BULK UPDATE / DELETE --------------------
+# ids per IN (...) list, well below every driver's bound-parameter limit
+BULK_CHUNK_SIZE = 500
+MAX_BULK_IDS = 10_000
+
+
+def _bulk_condition(selection: MemberBulkSelection):
+    """
+    WHERE clause for a bulk request's ids or filter.
+
+    Raises:
+        400: neither or both of ids/filter, an empty filter, or too many ids
+    """
+    if (selection.ids is None) == (selection.filter is None):
+        raise HTTPException(status_code=400, detail="Send either ids or filter")
+    if selection.ids is not None:
+        if len(selection.ids) > MAX_BULK_IDS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_IDS} ids per request")
+        return Member.id.in_(selection.ids)
+
+    f = selection.filter
+    conditions = []
+    if f.membership_type is not None:
+        conditions.append(Member.membership_type == f.membership_type)
+    if f.gender is not None:
+        conditions.append(Member.gender == f.gender)
+    if f.membership_end_before is not None:
+        conditions.append(Member.membership_end < f.membership_end_before)
+    if f.membership_end_after is not None:
+        conditions.append(Member.membership_end > f.membership_end_after)
+    if f.created_before is not None:
+        conditions.append(Member.created_at < f.created_before)
+    if not conditions:
+        # an empty filter would hit every member
+        raise HTTPException(status_code=400, detail="Filter needs at least one condition")
+    return and_(*conditions)
+
+
+def _chunks(items: list, size: int = BULK_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+@router.patch("/bulk", response_model=MemberBulkResult,
+              dependencies=[Depends(require_roles(["admin", "receptionist"]))])
+def bulk_update_members(data: MemberBulkUpdate, db: Session = Depends(get_db)):
+    """
+    Apply the same partial update to many members with one UPDATE statement,
+    e.g. extend membership_end for a cohort. Returns the number updated.
+    """
+    changes = data.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="No changes given")
+
+    # A Core UPDATE skips the mapper, so bump what version_id_col/onupdate
+    # would have: ETags and /members/changes depend on them.
+    result = db.execute(
+        update(Member).where(_bulk_condition(data)).values(
+            **changes, row_version=Member.row_version + 1, updated_at=func.now(),
+        ).execution_options(synchronize_session=False)
+    )
+    db.commit()
+    # name and phone are not bulk-editable, so the search index is unaffected
+    return {"updated": result.rowcount}
+
+
+@router.delete("/bulk", response_model=MemberBulkResult,
+               dependencies=[Depends(require_roles(["admin"]))])
+def bulk_delete_members(selection: MemberBulkSelection, background_tasks: BackgroundTasks,
+                        db: Session = Depends(get_db)):
+    """
+    Delete many members in one transaction, by ids or filter.
+
+    Leaves tombstones for /members/changes and releases their photos;
+    storage is purged after the response. Returns the number deleted.
+    """
+    rows = db.query(Member.id, Member.image_url).filter(_bulk_condition(selection)).with_for_update().all()
+    if not rows:
+        return {"deleted": 0}
+    ids = [member_id for member_id, _ in rows]
+
+    released = release(db, [key for _, image_url in rows for key in _member_image_keys(image_url)])
+    db.execute(insert(MemberTombstone), [{"member_id": member_id} for member_id in ids])
+    deleted = 0
+    try:
+        for chunk in _chunks(ids):
+            deleted += db.execute(
+                delete(Member).where(Member.id.in_(chunk)).execution_options(synchronize_session=False)
+            ).rowcount
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Some members still have memberships; remove those first")
+
+    for member_id in ids:
+        member_search_index.remove(member_id)
+    background_tasks.add_task(purge, released)
+    return {"deleted": deleted}
+
+
 # -------------------- GET MEMBER BY ID --------------------
 @router.get("/{member_id}", response_model=MemberOut,
             dependencies=[Depends(require_roles(["admin", "receptionist"]))])
-def get_member_by_id(member_id: int, db: Session = Depends(get_db)):
+def get_member_by_id(member_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Member detail; answers If-None-Match with 304 while the member is unchanged."""
     member = db.query(Member).filter(Member.id == member_id).first()
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
+
+    if not_modified(request, response, _member_etag(member)):
+        return not_modified_response(response)
     
     # Calculate next_fitness_checkup_date if not already set
     if member.next_fitness_checkup_date is None:
-        member.next_fitness_checkup_date = calculate_next_fitness_checkup_date(
-            membership_start=member.membership_start,
-            created_at=member.created_at,
-            last_checkup_date=member.last_fitness_checkup_date,
-            checkpoint_interval_days=21,
-        )
+        member.next_fitness_checkup_date = _next_checkup_date(member)
     
     return member
 
 
+def _next_checkup_date(member: Member):
+    return member.next_fitness_checkup_date or calculate_next_fitness_checkup_date(
+        membership_start=member.membership_start,
+        created_at=member.created_at,
+        last_checkup_date=member.last_fitness_checkup_date,
+        checkpoint_interval_days=21,
+    )
+
+
+def _member_etag(member: Member) -> str:
+    # the computed checkup date moves with the calendar, not with the row
+    return make_etag("member", member.id, member.row_version, _next_checkup_date(member))
+
+
 # -------------------- UPDATE MEMBER --------------------
 @router.put("/{member_id}", response_model=MemberOut,
             dependencies=[Depends(require_roles(["admin", "receptionist"]))])
-def update_member(member_id: int, data: MemberUpdate, db: Session = Depends(get_db)):
+def update_member(member_id: int, data: MemberUpdate, request: Request, response: Response,
+                  db: Session = Depends(get_db)):
+    """Update a member; with If-Match, only if it is still the version the client read."""
     member = db.query(Member).filter(Member.id == member_id).first()
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
+    check_if_match(request, _member_etag(member))
 
     updates = data.model_dump(exclude_unset=True)
     for key, value in updates.items():
         setattr(member, key, value)
 
-    db.commit()
+    try:
+        db.commit()
+    except StaleDataError:
+        # changed by a concurrent request after we read it
+        db.rollback()
+        raise HTTPException(status_code=412, detail="Resource was modified by someone else; reload and retry")
     db.refresh(member)
+    member_search_index.upsert(member.id, member.name, member.phone)
+    response.headers["ETag"] = _member_etag(member)
     return member
 
 
 # -------------------- DELETE MEMBER --------------------
 @router.delete("/{member_id}",
                dependencies=[Depends(require_roles(["admin"]))])
-def delete_member(member_id: int, db: Session = Depends(get_db)):
+def delete_member(member_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     member = db.query(Member).filter(Member.id == member_id).first()
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
 
+    released = release(db, _member_image_keys(member.image_url))
+    # leave a tombstone for /members/changes clients
+    db.add(MemberTombstone(member_id=member.id))
     db.delete(member)
     db.commit()
+    member_search_index.remove(member_id)
+    background_tasks.add_task(purge, released)
     return {"message": "Member deleted successfully"}
 
 
 # -------------------- UPLOAD MEMBER IMAGE --------------------
+# uploads are received and resized here before they move into storage
+STAGING_DIR = Path(".cache/staging")
+IMAGE_CONTENT_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+
+
+def _member_image_keys(image_url: str | None) -> list[str]:
+    """Storage keys of a stored image: all variants, or the single legacy file."""
+    if not image_url:
+        return []
+    variants = variant_urls(image_url)
+    urls = list(variants.values()) if variants else [image_url]
+    keys = [get_storage().key_from_url(url) for url in urls]
+    return [key for key in keys if key]
+
+
+def _store_image_variants(source: Path, digest: str) -> dict[str, str]:
+    """Resize an upload into its variants and store them; returns {variant: key}."""
+    storage = get_storage()
+    ext = "jpg" if IMAGE_FORMAT == "jpeg" else IMAGE_FORMAT
+    keys = {name: content_key("members", digest, f"_{name}.{ext}") for name in VARIANT_SIZES}
+    if all(storage.exists(key) for key in keys.values()):
+        return keys  # identical photo already stored, nothing to resize
+
+    # Resize off the API process; this runs in a threadpool thread, so
+    # waiting on the result doesn't block the event loop.
+    with tempfile.TemporaryDirectory(dir=STAGING_DIR) as out_dir:
+        files = get_image_pool(IMAGE_WORKERS).submit(
+            process_image, str(source), digest, out_dir, IMAGE_FORMAT, IMAGE_QUALITY,
+        ).result()
+        for name, key in keys.items():
+            storage.put_file(key, Path(out_dir) / files[name], IMAGE_CONTENT_TYPES[IMAGE_FORMAT])
+    return keys
+
+
 @router.post("/{member_id}/image", response_model=MemberOut,
              dependencies=[Depends(require_roles(["admin", "receptionist"]))])
-def upload_member_image(member_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
-    """Upload or replace member profile image"""
+def upload_member_image(member_id: int, background_tasks: BackgroundTasks, file: UploadFile = File(...),
+                        db: Session = Depends(get_db)):
+    """
+    Upload or replace member profile image.
+
+    The upload is streamed to a temp file in chunks (JPEG/PNG/WebP by magic
+    bytes, at most MAX_IMAGE_UPLOAD_BYTES), resized into thumb/card/full
+    variants by the image worker pool and stored under content-hash keys,
+    so an identical photo is stored once. image_url points at the full
+    variant and image_variants lists all. The previous image is released
+    and purged from storage after the response if nothing else uses it.
+    """
     
     # Check if member exists
     member = db.query(Member).filter(Member.id == member_id).first()
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
     
-    # Validate file type
-    allowed_extensions = {"jpg", "jpeg", "png"}
-    file_ext = file.filename.split(".")[-1].lower() if file.filename else ""
-    if file_ext not in allowed_extensions:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
-        )
-    
-    # Create uploads directory if not exists
-    uploads_dir = Path("uploads/members")
-    uploads_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Delete old image if exists
-    if member.image_url:
-        old_image_path = Path(member.image_url)
-        if old_image_path.exists():
-            try:
-                old_image_path.unlink()
-            except Exception as e:
-                print(f"Failed to delete old image: {e}")
-    
-    # Save new image with member_id as filename
-    image_filename = f"member_{member_id}.{file_ext}"
-    image_path = uploads_dir / image_filename
-    relative_path = f"uploads/members/{image_filename}"
-    
+    tmp_path, _, digest = receive_upload(file, STAGING_DIR, MAX_IMAGE_UPLOAD_BYTES)
     try:
-        with open(image_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        keys = _store_image_variants(tmp_path, digest)
+    except (UnidentifiedImageError, Image.DecompressionBombError):
+        raise HTTPException(status_code=400, detail="File is not a valid image")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to save image: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to process image: {str(e)}")
     finally:
-        file.file.close()
+        tmp_path.unlink(missing_ok=True)
     
-    # Update member record with image path
-    member.image_url = relative_path
+    # Update member record with the full-size variant; the others derive from it
+    acquire(db, keys.values())
+    released = release(db, _member_image_keys(member.image_url))
+    member.image_url = get_storage().url(keys["full"])
     db.commit()
     db.refresh(member)
+    background_tasks.add_task(purge, released)
     
     return member
 
@@ -229,26 +486,19 @@ def upload_member_image(member_id: int, file: UploadFile = File(...), db: Sessio
 # -------------------- DELETE MEMBER IMAGE --------------------
 @router.delete("/{member_id}/image", response_model=MemberOut,
                dependencies=[Depends(require_roles(["admin", "receptionist"]))])
-def delete_member_image(member_id: int, db: Session = Depends(get_db)):
-    """Delete member profile image"""
+def delete_member_image(member_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Delete member profile image (all of its variants)"""
     
     # Check if member exists
     member = db.query(Member).filter(Member.id == member_id).first()
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
     
-    # Delete image file if exists
-    if member.image_url:
-        image_path = Path(member.image_url)
-        if image_path.exists():
-            try:
-                image_path.unlink()
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"Failed to delete image: {str(e)}")
-    
-    # Clear image_url from database
+    # Clear image_url from database; unused files go once the response is sent
+    released = release(db, _member_image_keys(member.image_url))
     member.image_url = None
     db.commit()
     db.refresh(member)
+    background_tasks.add_task(purge, released)
     
     return member
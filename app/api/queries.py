@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.models.query import Query
 from app.schemas.query import QueryCreate, QueryResponse
+from app.core.config import FAST_LIST_RESPONSES
+from app.utils.fast_json import FastJSONResponse, schema_columns, rows_to_dicts
 from typing import List
 
 router = APIRouter(prefix="/queries", tags=["Queries"])
@@ -22,6 +24,10 @@ def create_query(payload: QueryCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=List[QueryResponse])
 def get_all_queries(db: Session = Depends(get_db)):
+    if FAST_LIST_RESPONSES:
+        columns = schema_columns(Query, QueryResponse)
+        rows = db.query(*columns).order_by(Query.created_at.desc()).all()
+        return FastJSONResponse(rows_to_dicts(rows, [c.key for c in columns]))
     return db.query(Query).order_by(Query.created_at.desc()).all()
 
 @router.patch("/{query_id}/status")
@@ -1,8 +1,9 @@
 # app/api/trainer_profiles.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 from app.db.database import get_db
 from app.models.trainers_profile import TrainerProfile
 from app.models.user import User, role as RoleEnum
@@ -14,6 +15,9 @@ from app.schemas.trainers_profile import (
 )
 from app.auth.hashing import hash_password
 from app.api.deps import require_roles
+from app.core.config import FAST_LIST_RESPONSES
+from app.utils.fast_json import FastJSONResponse, rows_to_dicts
+from app.utils.etag import check_if_match, make_etag, not_modified, not_modified_response
 from typing import List
 
 security = HTTPBearer()
@@ -130,6 +134,23 @@ def attach_trainer_to_user(payload: TrainerProfileCreateForExistingUser, db: Ses
 # List trainers (admin + receptionist + trainer)
 @router.get("/", response_model=List[TrainerProfileOut], dependencies=[Depends(require_roles(["admin","receptionist","trainer"]))])
 def list_trainers(db: Session = Depends(get_db)):
+    if FAST_LIST_RESPONSES:
+        columns = [
+            TrainerProfile.id,
+            TrainerProfile.user_id,
+            User.email.label("user_email"),
+            User.name.label("user_name"),
+            TrainerProfile.specialization,
+            TrainerProfile.bio,
+            TrainerProfile.experience_years,
+            TrainerProfile.phone,
+            TrainerProfile.certifications,
+            TrainerProfile.created_at,
+            TrainerProfile.updated_at,
+        ]
+        rows = db.query(*columns).join(User, User.id == TrainerProfile.user_id).all()
+        return FastJSONResponse(rows_to_dicts(rows, [c.key for c in columns]))
+
     rows = db.query(TrainerProfile).join(User).all()
     out = []
     for p in rows:
@@ -150,10 +171,12 @@ def list_trainers(db: Session = Depends(get_db)):
 
 # Get single trainer profile
 @router.get("/{trainer_id}", response_model=TrainerProfileOut, dependencies=[Depends(require_roles(["admin","receptionist","trainer"]))])
-def get_trainer(trainer_id: int, db: Session = Depends(get_db)):
+def get_trainer(trainer_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     p = db.query(TrainerProfile).filter(TrainerProfile.id == trainer_id).join(User).first()
     if not p:
         raise HTTPException(status_code=404, detail="Trainer not found")
+    if not_modified(request, response, _trainer_etag(p)):
+        return not_modified_response(response)
     return TrainerProfileOut(
         id=p.id,
         user_id=p.user_id,
@@ -168,19 +191,31 @@ def get_trainer(trainer_id: int, db: Session = Depends(get_db)):
         updated_at=p.updated_at
     )
 
+def _trainer_etag(p: TrainerProfile) -> str:
+    # user_name/user_email come from the users row, which has no version of its own
+    return make_etag("trainer", p.id, p.row_version, p.user.email, p.user.name)
+
 # Update trainer profile
 @router.put("/{trainer_id}", response_model=TrainerProfileOut, dependencies=[Depends(require_roles(["admin","receptionist"]))])
-def update_trainer(trainer_id: int, data: TrainerProfileUpdate, db: Session = Depends(get_db)):
+def update_trainer(trainer_id: int, data: TrainerProfileUpdate, request: Request, response: Response,
+                   db: Session = Depends(get_db)):
     p = db.query(TrainerProfile).filter(TrainerProfile.id == trainer_id).first()
     if not p:
         raise HTTPException(status_code=404, detail="Trainer not found")
+    # optimistic concurrency: only update the version the client read
+    check_if_match(request, _trainer_etag(p))
     
     updates = data.model_dump(exclude_unset=True)
     for k, v in updates.items():
         setattr(p, k, v)
 
-    db.commit()
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=412, detail="Resource was modified by someone else; reload and retry")
     db.refresh(p)
+    response.headers["ETag"] = _trainer_etag(p)
     return TrainerProfileOut(
         id=p.id,
         user_id=p.user_id,
@@ -1,12 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date, timedelta
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.core.config import FAST_LIST_RESPONSES
 from app.db.database import get_db
-from app.models.workout import Workout
-from app.schemas.workout import WorkoutCreate, WorkoutUpdate, WorkoutOut
+from app.models.workout import Workout, WorkoutTombstone
+from app.schemas.workout import (
+    WorkoutCreate,
+    WorkoutUpdate,
+    WorkoutOut,
+    WorkoutListItem,
+    WorkoutPage,
+    WorkoutStatsOut,
+    WorkoutSyncRequest,
+    WorkoutSyncOut,
+)
 from app.api.deps import get_current_user
 from app.models.user import User
+from app.utils.fast_json import FastJSONResponse
+from app.utils.pagination import keyset_page
+from app.utils.workout_stats import bucket_start_expr, compute_streaks
 
 security = HTTPBearer()
 router = APIRouter(
@@ -15,17 +32,239 @@ router = APIRouter(
     dependencies=[Depends(security)]
 )
 
-@router.get("/", response_model=list[WorkoutOut])
+LIST_FIELDS = tuple(WorkoutListItem.model_fields)
+
+
+@router.get("/", response_model=WorkoutPage, response_model_exclude_unset=True)
 def get_workouts(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    fields: Optional[str] = Query(None, description="Comma separated, e.g. id,name,date,duration"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return (
-        db.query(Workout)
-        .filter(Workout.user_id == current_user.id)
-        .order_by(Workout.created_at.desc())
+    """
+    Current user's workouts, newest date first, keyset-paginated on (date, id).
+    Workouts without a date come last. `fields` selects only the given
+    columns (id is always included), e.g. to skip description/notes text.
+    """
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = set(selected) - set(LIST_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+    else:
+        selected = list(LIST_FIELDS)
+    # id and date drive the cursor, so they are always fetched
+    columns = list(dict.fromkeys(["id", "date", *selected]))
+
+    query = db.query(*[getattr(Workout, c) for c in columns]).filter(Workout.user_id == current_user.id)
+    if date_from:
+        query = query.filter(Workout.date >= date_from)
+    if date_to:
+        query = query.filter(Workout.date <= date_to)
+
+    rows, next_cursor = keyset_page(query, Workout.date, Workout.id, cursor, limit, nullable=True)
+    keep = ["id", *selected]
+    page = {
+        "workouts": [{c: getattr(row, c) for c in keep} for row in rows],
+        "next_cursor": next_cursor,
+    }
+    # rows are already column-only dicts; the fast path just skips re-validation
+    return FastJSONResponse(page) if FAST_LIST_RESPONSES else page
+
+@router.get("/stats", response_model=WorkoutStatsOut)
+def get_workout_stats(
+    granularity: Literal["week", "month"] = "week",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Weekly or monthly totals/averages, streaks and personal bests for the
+    current user. Everything is aggregated in SQL over the (user_id, date)
+    index, so the payload is one row per bucket however long the history is.
+    Workouts without a date are not counted.
+    """
+    filters = [Workout.user_id == current_user.id, Workout.date.isnot(None)]
+    if date_from:
+        filters.append(Workout.date >= date_from)
+    if date_to:
+        filters.append(Workout.date <= date_to)
+
+    bucket = bucket_start_expr(db.get_bind().dialect.name, granularity, Workout.date).label("period_start")
+    bucket_rows = (
+        db.query(
+            bucket,
+            func.count(Workout.id),
+            func.coalesce(func.sum(Workout.duration), 0),
+            func.coalesce(func.sum(Workout.calories), 0),
+            func.avg(Workout.duration),
+            func.avg(Workout.calories),
+        )
+        .filter(*filters)
+        .group_by(bucket)
+        .order_by(bucket)
         .all()
     )
+    buckets = [
+        {
+            "period_start": period_start,
+            "workouts": count,
+            "total_duration": total_duration,
+            "total_calories": total_calories,
+            "avg_duration": round(float(avg_duration), 1) if avg_duration is not None else None,
+            "avg_calories": round(float(avg_calories), 1) if avg_calories is not None else None,
+        }
+        for period_start, count, total_duration, total_calories, avg_duration, avg_calories in bucket_rows
+    ]
+
+    workout_dates = [
+        d for (d,) in db.query(Workout.date).filter(*filters).distinct().order_by(Workout.date).all()
+    ]
+    current_streak, longest_streak = compute_streaks(workout_dates, date.today())
+
+    def personal_best(column):
+        row = (
+            db.query(Workout.id, Workout.name, Workout.date, column)
+            .filter(*filters, column.isnot(None))
+            .order_by(column.desc(), Workout.date.asc())
+            .first()
+        )
+        if not row:
+            return None
+        return {"workout_id": row[0], "name": row[1], "date": row[2], "value": row[3]}
+
+    return {
+        "granularity": granularity,
+        "total_workouts": sum(b["workouts"] for b in buckets),
+        "total_duration": sum(b["total_duration"] for b in buckets),
+        "total_calories": sum(b["total_calories"] for b in buckets),
+        "current_streak_days": current_streak,
+        "longest_streak_days": longest_streak,
+        "longest_workout": personal_best(Workout.duration),
+        "most_calories": personal_best(Workout.calories),
+        "buckets": buckets,
+    }
+
+# timestamps are second precision on MySQL DATETIME / SQLite CURRENT_TIMESTAMP,
+# so re-send anything from the watermark's second; clients upsert by id anyway
+SYNC_OVERLAP = timedelta(seconds=1)
+
+
+@router.post("/sync", response_model=WorkoutSyncOut)
+def sync_workouts(
+    payload: WorkoutSyncRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delta sync for offline clients.
+
+    1. Applies the client's queued creates/updates/deletes in one transaction.
+       Changes are keyed by client_id, so retrying the same request is safe.
+    2. Returns only workouts changed and deleted since `since`, plus a new
+       watermark to send next time.
+    """
+    changes = payload.changes
+    applied = []
+
+    if changes:
+        client_ids = {c.client_id for c in changes}
+        by_client_id = {
+            w.client_id: w for w in db.query(Workout).filter(
+                Workout.user_id == current_user.id,
+                Workout.client_id.in_(client_ids)
+            ).all()
+        }
+        server_ids = {c.id for c in changes if c.id is not None and c.client_id not in by_client_id}
+        by_id = {
+            w.id: w for w in db.query(Workout).filter(
+                Workout.user_id == current_user.id,
+                Workout.id.in_(server_ids)
+            ).all()
+        } if server_ids else {}
+        tombstoned = {
+            client_id for (client_id,) in db.query(WorkoutTombstone.client_id).filter(
+                WorkoutTombstone.user_id == current_user.id,
+                WorkoutTombstone.client_id.in_(client_ids)
+            ).all()
+        }
+
+        results = []
+        for change in changes:
+            workout = by_client_id.get(change.client_id) or by_id.get(change.id)
+            fields = change.model_dump(exclude_unset=True, exclude={"client_id", "id", "deleted"})
+
+            if change.deleted:
+                if workout is not None and workout in db.new:
+                    # created earlier in this batch: never written, so nothing to tombstone
+                    db.expunge(workout)
+                    by_client_id.pop(change.client_id, None)
+                    results.append((change.client_id, None, "deleted"))
+                elif workout:
+                    _delete_with_tombstone(db, workout)
+                    by_client_id.pop(change.client_id, None)
+                    by_id.pop(workout.id, None)
+                    tombstoned.add(change.client_id)
+                    results.append((change.client_id, workout, "deleted"))
+                else:
+                    results.append((change.client_id, None, "deleted" if change.client_id in tombstoned else "missing"))
+            elif workout:
+                for key, value in fields.items():
+                    setattr(workout, key, value)
+                if workout.client_id is None:
+                    workout.client_id = change.client_id
+                    by_client_id[change.client_id] = workout
+                results.append((change.client_id, workout, "updated"))
+            elif change.client_id in tombstoned:
+                # already deleted on another device; don't resurrect it
+                results.append((change.client_id, None, "deleted"))
+            elif change.id is not None:
+                results.append((change.client_id, None, "missing"))
+            elif not fields.get("name"):
+                results.append((change.client_id, None, "invalid"))
+            else:
+                workout = Workout(**fields, client_id=change.client_id, user_id=current_user.id)
+                db.add(workout)
+                by_client_id[change.client_id] = workout
+                results.append((change.client_id, workout, "created"))
+
+        db.flush()
+        applied = [
+            {"client_id": client_id, "id": workout.id if workout is not None else None, "status": status_}
+            for client_id, workout, status_ in results
+        ]
+        db.commit()
+
+    # database clock, so the watermark is comparable with updated_at / deleted_at
+    watermark = db.scalar(select(func.now()))
+
+    workouts_query = db.query(Workout).filter(Workout.user_id == current_user.id)
+    deleted = []
+    if payload.since is not None:
+        since = payload.since - SYNC_OVERLAP
+        workouts_query = workouts_query.filter(Workout.updated_at >= since)
+        deleted = [
+            {"id": t.workout_id, "client_id": t.client_id, "deleted_at": t.deleted_at}
+            for t in db.query(WorkoutTombstone).filter(
+                WorkoutTombstone.user_id == current_user.id,
+                WorkoutTombstone.deleted_at >= since
+            ).all()
+        ]
+
+    return {
+        "watermark": watermark,
+        "applied": applied,
+        "workouts": workouts_query.order_by(Workout.updated_at.asc()).all(),
+        "deleted": deleted,
+    }
 
 @router.get("/{workout_id}", response_model=WorkoutOut)
 def get_workout_by_id(
@@ -106,7 +345,17 @@ def delete_workout(
             detail="Workout not found"
         )
 
-    db.delete(workout)
+    _delete_with_tombstone(db, workout)
     db.commit()
 
     return {"message": "Workout deleted successfully"}
+
+
+def _delete_with_tombstone(db: Session, workout: Workout):
+    """Delete a workout and leave a tombstone for /workouts/sync clients."""
+    db.add(WorkoutTombstone(
+        workout_id=workout.id,
+        user_id=workout.user_id,
+        client_id=workout.client_id
+    ))
+    db.delete(workout)
@@ -31,6 +31,11 @@
 #    - Usage:
 #        - Called during protected route access to extract user or session information from the token, ensuring the token is trustworthy.
 #
+# 3. token_subject(headers) -> Optional[str]
+#    - Purpose: The "sub" of a valid bearer token in the request headers, or None.
+#    - Usage:
+#        - Used by middlewares that act per user before any route dependency runs (idempotency keys, read routing).
+#
 # Methods and libraries in use:
 # - datetime, timedelta, timezone: Used to create timestamp fields in UTC and handle expiration times.
 # - jose.jwt.encode: Serializes and signs the JWT payload, producing a secure token.
@@ -57,3 +62,12 @@ def decode_access_token(token: str) -> Optional[dict]:
         return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except JWTError:
         return None
+
+def token_subject(headers) -> Optional[str]:
+    authorization = headers.get("authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return None
+    payload = decode_access_token(authorization[7:].strip())
+    if payload and payload.get("sub"):
+        return str(payload["sub"])
+    return None
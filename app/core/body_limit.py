@@ -0,0 +1,51 @@
+"""
+Request body size limit for upload routes.
+
+Starlette's multipart parser spools the whole file to disk before the
+endpoint runs, so a limit checked inside the endpoint still lets a client
+fill the disk. This middleware counts body bytes as they arrive and stops
+the request with 413 as soon as the limit is crossed: up front when
+Content-Length already says so, otherwise mid-stream.
+"""
+
+import re
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+# multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app, max_bytes: int, path_pattern: str):
+        self.app = app
+        self.max_bytes = max_bytes + MULTIPART_OVERHEAD
+        self.path_pattern = re.compile(path_pattern)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT") \
+                or not self.path_pattern.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        detail = {"detail": "Request body too large"}
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await JSONResponse(detail, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # raised inside body parsing; FastAPI re-raises HTTPExceptions as-is
+                    raise HTTPException(status_code=413, detail=detail["detail"])
+            return message
+
+        await self.app(scope, limited_receive, send)
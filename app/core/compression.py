@@ -0,0 +1,209 @@
+"""
+Response compression (brotli / gzip).
+
+CompressionMiddleware compresses API responses, mostly the big JSON lists
+served to reception tablets on slow Wi-Fi. It skips:
+- small bodies (below minimum_size),
+- types that are already compressed (images, video, archives, fonts),
+- streaming responses such as the SSE attendance board,
+- responses that already carry a Content-Encoding,
+- excluded path prefixes (the /uploads mount handles itself).
+
+PrecompressedStaticFiles serves a compressed variant of a static file:
+first a "<file>.br" / "<file>.gz" shipped next to it, otherwise a copy
+compressed once and kept in a cache directory. Repeat requests never
+re-compress.
+
+brotli is optional; without it only gzip is offered.
+"""
+
+import gzip
+import os
+from pathlib import Path
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse
+from starlette.staticfiles import StaticFiles
+
+from app.utils.etag import etag_matches
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# content types that gain nothing from another compression pass
+INCOMPRESSIBLE_PREFIXES = ("image/", "video/", "audio/", "font/woff")
+INCOMPRESSIBLE_TYPES = {
+    "application/zip", "application/gzip", "application/x-gzip", "application/pdf",
+    "application/octet-stream", "text/event-stream",
+}
+# ...except these, which are text
+COMPRESSIBLE_EXCEPTIONS = {"image/svg+xml"}
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type in COMPRESSIBLE_EXCEPTIONS:
+        return True
+    if media_type in INCOMPRESSIBLE_TYPES:
+        return False
+    return not media_type.startswith(INCOMPRESSIBLE_PREFIXES)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header (q=0 means refused)."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 exclude_paths: tuple = ()):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.exclude_paths = tuple(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+                or not is_compressible(headers.get("content-type"))
+            ):
+                # streaming or not worth it: forward untouched from here on
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = await run_in_threadpool(
+                compress, body, encoding, self.gzip_level, self.brotli_quality
+            )
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            etag = headers.get("etag")
+            if etag and etag.endswith('"'):
+                # different bytes, different strong ETag (matched back by app/utils/etag.py)
+                headers["ETag"] = etag[:-1] + f'-{encoding}"'
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    def __init__(self, *args, cache_dir: str, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 4, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_dir = Path(cache_dir)
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        # static variants are compressed once, so spend more CPU on them
+        self.brotli_quality = max(brotli_quality, 9)
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if not isinstance(response, FileResponse) or response.status_code != 200:
+            return response
+        if not is_compressible(response.media_type):
+            return response
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            return response
+
+        variant = await run_in_threadpool(self._variant_path, Path(response.path), encoding)
+        if variant is None:
+            response.headers.add_vary_header("Accept-Encoding")
+            return response
+
+        headers = {"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+        if "cache-control" in response.headers:
+            headers["Cache-Control"] = response.headers["cache-control"]
+        # same resource, different bytes: the ETag must differ per encoding
+        headers["ETag"] = response.headers["etag"][:-1] + f'-{encoding}"'
+        return FileResponse(variant, media_type=response.media_type, headers=headers)
+
+    def is_not_modified(self, response_headers, request_headers) -> bool:
+        # a cached "<etag>-br" still validates the identity ETag checked here
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match:
+            return etag_matches(if_none_match, response_headers["etag"])
+        return super().is_not_modified(response_headers, request_headers)
+
+    def _variant_path(self, source: Path, encoding: str) -> Optional[Path]:
+        """Existing or freshly cached compressed copy of source, or None if not worth it."""
+        suffix = ".br" if encoding == "br" else ".gz"
+        source_stat = source.stat()
+        if source_stat.st_size < self.minimum_size:
+            return None
+
+        # 1) precompressed file shipped next to the original
+        sibling = source.with_name(source.name + suffix)
+        if sibling.is_file() and sibling.stat().st_mtime >= source_stat.st_mtime:
+            return sibling
+
+        # 2) our own cache, rebuilt when the source changes
+        try:
+            relative = source.resolve().relative_to(Path(self.directory).resolve())
+        except ValueError:
+            return None  # symlinked outside the mount; don't cache it
+        cached = self.cache_dir / (str(relative) + suffix)
+        if cached.is_file() and cached.stat().st_mtime >= source_stat.st_mtime:
+            return cached
+
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        data = compress(source.read_bytes(), encoding, self.gzip_level, self.brotli_quality)
+        tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, cached)
+        return cached
@@ -0,0 +1,87 @@
+"""
+In-process publish/subscribe for live dashboards (Server-Sent Events).
+
+Publishers (sync route handlers running in the threadpool, or scheduler
+jobs) call publish(); every connected SSE client owns an asyncio.Queue.
+Each event is encoded to its SSE wire format once and the same string is
+handed to every subscriber, so an idle dashboard costs one queue and no DB
+queries.
+
+Events carry a key (e.g. "checkout:42"); recently seen keys are dropped so
+the same change arriving from both the local publisher and the DB-polling
+fallback is only delivered once.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Optional
+
+SUBSCRIBER_QUEUE_SIZE = 256
+RECENT_KEYS_SIZE = 1024
+
+
+def format_sse(event: str, data, event_id: Optional[str] = None) -> str:
+    """Encode one Server-Sent Event message."""
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'), default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class EventBroker:
+    def __init__(self):
+        self._subscribers: set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._recent_keys: OrderedDict = OrderedDict()
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a new subscriber. Must be called from the event loop."""
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, event: str, data, key: Optional[str] = None):
+        """
+        Broadcast an event to every subscriber. Safe to call from any thread.
+        A None in a subscriber's queue means "you fell behind, reconnect".
+        """
+        if not self._subscribers or self._loop is None:
+            return
+        message = format_sse(event, data, key)
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, message, key)
+        except RuntimeError:
+            # loop already closed (shutdown)
+            pass
+
+    def _deliver(self, message: str, key: Optional[str]):
+        if key is not None:
+            if key in self._recent_keys:
+                return
+            self._recent_keys[key] = True
+            if len(self._recent_keys) > RECENT_KEYS_SIZE:
+                self._recent_keys.popitem(last=False)
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # slow client: drop it so it reconnects and gets a fresh snapshot
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+
+# Trainer check-in / checkout events for the reception board
+attendance_events = EventBroker()
@@ -0,0 +1,340 @@
+"""
+Idempotency-Key support for POST requests.
+
+Flaky Wi-Fi makes the frontend retry POSTs whose first attempt did reach
+the server. A client that sends an `Idempotency-Key: <uuid>` header gets
+the stored response of the first attempt replayed on every retry
+(marked `Idempotent-Replayed: true`), without the handler running again.
+
+- Keys are scoped to the user (JWT subject), method and path.
+- The same key with a different body is rejected with 422.
+- Concurrent duplicates are coalesced. In one worker, followers await the
+  leader's future. Across workers, an idempotency_keys row is claimed
+  before the handler runs, and the other workers poll it until the
+  response is stored (409 if it takes longer than the wait limit).
+- A claim whose request died stays locked for IDEMPOTENCY_LOCK_SECONDS
+  before a retry may take it over.
+- Responses are stored in the database for IDEMPOTENCY_TTL_SECONDS, with
+  an in-process LRU in front. 5xx, auth and rate-limit responses are not
+  stored; the retry runs again.
+
+Requests without the header, bodies larger than MAX_BODY_BYTES and
+excluded paths (login: its response holds a token) are passed through
+untouched.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from app.auth.jwt_handler import token_subject
+from app.db.database import SessionLocal
+from app.models.idempotency import IdempotencyKey
+
+MAX_KEY_LENGTH = 255
+MAX_BODY_BYTES = 1024 * 1024
+MAX_RESPONSE_BYTES = 1024 * 1024
+# depend on who asks or when, not on the request itself
+NOT_STORED_STATUSES = {401, 403, 408, 409, 429}
+POLL_SECONDS = 0.2
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was first used with a different request body."""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """Another request with the key is still running."""
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class IdempotencyStore:
+    """
+    acquire() returns the stored response for a key, or None when the
+    caller now owns the key and must call complete() or release().
+    """
+
+    def __init__(self, ttl_seconds: float, cache_size: int, lock_seconds: float, wait_seconds: float):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.lock = timedelta(seconds=lock_seconds)
+        self.wait_seconds = wait_seconds
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[float, StoredResponse]]" = OrderedDict()
+        # key -> future of the request running it in this process
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    # ---------- in-process ----------
+    def _cached(self, key: str) -> Optional[StoredResponse]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, stored = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return stored
+
+    def _remember(self, key: str, stored: StoredResponse):
+        self._cache[key] = (time.monotonic() + self.ttl.total_seconds(), stored)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _check(stored: StoredResponse, fingerprint: str) -> StoredResponse:
+        if stored.fingerprint != fingerprint:
+            raise IdempotencyKeyReused()
+        return stored
+
+    async def acquire(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        while True:
+            stored = self._cached(key)
+            if stored is not None:
+                return self._check(stored, fingerprint)
+
+            leader = self._inflight.get(key)
+            if leader is not None:
+                # same key already running in this process: wait for it
+                stored = await asyncio.shield(leader)
+                if stored is not None:
+                    return self._check(stored, fingerprint)
+                continue  # it failed without a stored response; try again
+
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            try:
+                stored = await self._claim_or_wait(key, fingerprint)
+            except BaseException:
+                self._resolve(key, None)
+                raise
+            if stored is None:
+                return None  # ours; complete() / release() resolve the future
+            self._remember(key, stored)
+            self._resolve(key, stored)
+            return self._check(stored, fingerprint)
+
+    def _resolve(self, key: str, stored: Optional[StoredResponse]):
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(stored)
+
+    async def complete(self, key: str, stored: StoredResponse):
+        try:
+            await run_in_threadpool(self._db_complete, key, stored)
+        finally:
+            self._remember(key, stored)
+            self._resolve(key, stored)
+
+    async def release(self, key: str):
+        try:
+            await run_in_threadpool(self._db_release, key)
+        finally:
+            self._resolve(key, None)
+
+    # ---------- database ----------
+    async def _claim_or_wait(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            claimed, stored = await run_in_threadpool(self._db_claim, key, fingerprint)
+            if claimed or stored is not None:
+                return stored
+            # running in another worker
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgress()
+            await asyncio.sleep(POLL_SECONDS)
+
+    def _db_claim(self, key: str, fingerprint: str) -> Tuple[bool, Optional[StoredResponse]]:
+        """(True, None) if claimed, (False, response) if stored, (False, None) if running elsewhere."""
+        now = _now()
+        with SessionLocal() as db:
+            db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.expires_at < now))
+            db.add(IdempotencyKey(key=key, fingerprint=fingerprint, locked_at=now, expires_at=now + self.ttl))
+            try:
+                db.commit()
+                return True, None
+            except IntegrityError:
+                db.rollback()
+
+            row = db.get(IdempotencyKey, key)
+            if row is None:
+                return False, None  # released meanwhile; claim again next round
+            if row.status_code is not None:
+                headers = [tuple(pair) for pair in json.loads(row.headers or "[]")]
+                return False, StoredResponse(row.fingerprint, row.status_code, headers, row.body or b"")
+
+            # take over a claim whose request died without releasing it
+            taken = db.execute(
+                update(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status_code.is_(None),
+                    IdempotencyKey.locked_at < now - self.lock,
+                ).values(fingerprint=fingerprint, locked_at=now, expires_at=now + self.ttl)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            return bool(taken), None
+
+    def _db_complete(self, key: str, stored: StoredResponse):
+        with SessionLocal() as db:
+            db.execute(
+                update(IdempotencyKey).where(IdempotencyKey.key == key).values(
+                    status_code=stored.status_code, headers=json.dumps(stored.headers), body=stored.body,
+                )
+            )
+            db.commit()
+
+    def _db_release(self, key: str):
+        with SessionLocal() as db:
+            db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)))
+            db.commit()
+
+
+def purge_expired_idempotency_keys():
+    """Scheduler job: drop stored responses past their TTL."""
+    with SessionLocal() as db:
+        deleted = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < _now())).rowcount
+        db.commit()
+    if deleted:
+        print(f"🧹 Purged {deleted} expired idempotency keys")
+
+
+def _scoped_key(headers: Headers, method: str, path: str, key: str) -> str:
+    subject = token_subject(headers) or "anonymous"
+    return hashlib.sha256(f"{subject}\n{method} {path}\n{key}".encode("utf-8")).hexdigest()
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app, store: IdempotencyStore, methods=("POST",), exclude_paths=()):
+        self.app = app
+        self.store = store
+        self.methods = set(methods)
+        self.exclude_paths = tuple(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in self.methods \
+                or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        client_key = headers.get("idempotency-key")
+        content_length = headers.get("content-length", "0")
+        if client_key is None or not content_length.isdigit() or int(content_length) > MAX_BODY_BYTES:
+            await self.app(scope, receive, send)
+            return
+        if not client_key.strip() or len(client_key) > MAX_KEY_LENGTH:
+            await JSONResponse({"detail": "Invalid Idempotency-Key"}, status_code=400)(scope, receive, send)
+            return
+
+        body, disconnected = await _read_body(receive)
+        if disconnected:
+            return
+        key = _scoped_key(headers, scope["method"], scope["path"], client_key)
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        try:
+            stored = await self.store.acquire(key, fingerprint)
+        except IdempotencyKeyReused:
+            await JSONResponse({"detail": "Idempotency-Key was already used with a different request body"},
+                               status_code=422)(scope, receive, send)
+            return
+        except IdempotencyKeyInProgress:
+            await JSONResponse({"detail": "A request with this Idempotency-Key is still in progress"},
+                               status_code=409)(scope, receive, send)
+            return
+
+        if stored is not None:
+            await _replay(stored, send)
+            return
+        await self._run_and_store(scope, receive, send, key, fingerprint, body)
+
+    async def _run_and_store(self, scope, receive, send, key, fingerprint, body):
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        start = None
+        chunks = []
+        size = 0
+        storable = True
+        client_gone = False
+
+        async def capture_send(message):
+            nonlocal start, size, storable, client_gone
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if size > MAX_RESPONSE_BYTES:
+                    storable = False
+                    chunks.clear()
+                elif storable:
+                    chunks.append(message.get("body", b""))
+            else:
+                storable = False  # file responses etc.
+            if client_gone:
+                return
+            try:
+                await send(message)
+            except OSError:
+                # the retry this key exists for gets the stored response,
+                # so let the handler finish and keep capturing
+                client_gone = True
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await self.store.release(key)
+            raise
+
+        status = start["status"] if start else 500
+        if not storable or status >= 500 or status in NOT_STORED_STATUSES:
+            await self.store.release(key)
+            return
+        headers = [(name.decode("latin-1"), value.decode("latin-1")) for name, value in start.get("headers", [])]
+        await self.store.complete(key, StoredResponse(fingerprint, status, headers, b"".join(chunks)))
+
+
+async def _read_body(receive) -> Tuple[bytes, bool]:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return b"", True
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks), False
+
+
+async def _replay(stored: StoredResponse, send):
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in stored.headers]
+    headers.append((b"idempotent-replayed", b"true"))
+    await send({"type": "http.response.start", "status": stored.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": stored.body, "more_body": False})
@@ -0,0 +1,82 @@
+"""
+Routes GET requests to the read replicas (app/db/replicas.py).
+
+ReadRoutingMiddleware picks one replica per GET/HEAD request, so every
+session the request gets from get_db / get_async_db is opened on that
+replica and consecutive requests spread across them. Other methods stay
+on the primary.
+
+Read-your-writes: a successful write keeps its user's reads on the primary
+for `sticky_seconds`, long enough for the replicas to catch up. Users are
+told apart by JWT subject, and each worker keeps its own record. The
+response to the write also carries `X-Primary-Until: <unix time>`. A
+client that echoes it back, as the frontend does, stays on the primary
+whichever worker it lands on.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.datastructures import Headers
+
+from app.auth.jwt_handler import token_subject
+from app.db.replicas import ReplicaSet, replica_reads
+
+READ_METHODS = {"GET", "HEAD"}
+PRIMARY_UNTIL_HEADER = "x-primary-until"
+
+
+class ReadRoutingMiddleware:
+    def __init__(self, app, replicas: ReplicaSet, sticky_seconds: float):
+        self.app = app
+        self.replicas = replicas
+        self.sticky_seconds = sticky_seconds
+        # subject -> time until which their reads go to the primary, oldest first
+        self._sticky: "OrderedDict[str, float]" = OrderedDict()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        subject = token_subject(headers)
+
+        if scope["method"] in READ_METHODS:
+            replica = None if self._on_primary(subject, headers) else self.replicas.pick()
+            with replica_reads(replica):
+                await self.app(scope, receive, send)
+            return
+
+        async def routed_send(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.sticky_seconds
+                self._remember(subject, until)
+                message = {**message, "headers": [
+                    *message.get("headers", []), (PRIMARY_UNTIL_HEADER.encode(), f"{until:.3f}".encode()),
+                ]}
+            await send(message)
+
+        await self.app(scope, receive, routed_send)
+
+    def _on_primary(self, subject: Optional[str], headers: Headers) -> bool:
+        now = time.time()
+        try:
+            if float(headers.get(PRIMARY_UNTIL_HEADER, "0")) > now:
+                return True
+        except ValueError:
+            pass
+        return subject is not None and self._sticky.get(subject, 0) > now
+
+    def _remember(self, subject: Optional[str], until: float):
+        if subject is None:
+            return
+        self._sticky.pop(subject, None)
+        self._sticky[subject] = until
+        # every window is the same length, so the oldest entries expire first
+        now = time.time()
+        while self._sticky:
+            oldest = next(iter(self._sticky.values()))
+            if oldest > now:
+                break
+            self._sticky.popitem(last=False)
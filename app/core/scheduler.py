@@ -0,0 +1,45 @@
+"""
+Lightweight in-process scheduler for periodic background jobs.
+
+Each job is a plain sync function run every `interval_seconds` in a worker
+thread (so blocking DB calls don't stall the event loop). The scheduler is
+started and stopped from the FastAPI lifespan in app/main.py.
+"""
+
+import asyncio
+from typing import Callable, List, Optional
+
+
+class Scheduler:
+    def __init__(self):
+        self._jobs: List[tuple] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def add_job(self, func: Callable[[], None], interval_seconds: float, name: Optional[str] = None):
+        """Register a sync function to run every interval_seconds."""
+        self._jobs.append((func, interval_seconds, name or func.__name__))
+
+    async def _run_forever(self, func, interval_seconds, name):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(func)
+            except Exception as e:
+                # a failing run must not kill the loop; try again next tick
+                print(f"⚠️  Background job '{name}' failed: {e}")
+
+    def start(self):
+        for func, interval_seconds, name in self._jobs:
+            task = asyncio.create_task(self._run_forever(func, interval_seconds, name), name=name)
+            self._tasks.append(task)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        # the lifespan registers its jobs again on the next startup
+        self._jobs.clear()
+
+
+scheduler = Scheduler()
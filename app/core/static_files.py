@@ -0,0 +1,86 @@
+"""
+Cache-friendly serving of /uploads.
+
+Member photos are content-addressed (members/ab/cd/<hash>_<variant>.webp,
+see app/storage): a URL never changes content, a new photo gets a new
+URL. Such files are served with
+
+    Cache-Control: public, max-age=31536000, immutable
+    ETag: "<content hash>"            (strong, taken from the name)
+
+so browsers keep them for a year and never revalidate. Other files (legacy
+member_{id}.png uploads) may be overwritten in place, so they get
+"no-cache" plus a strong ETag computed from their bytes: clients revalidate
+and receive a 304 without a body while the file is unchanged.
+
+Range requests (single and multi-range, If-Range) come from Starlette's
+FileResponse. It also hands the file path to the server through the ASGI
+"http.response.pathsend" extension when the server offers it, so the
+server can sendfile() it without copying through Python.
+"""
+
+import hashlib
+import os
+import re
+import stat
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from app.core.compression import PrecompressedStaticFiles
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# 16+ hex chars at the start of the file name or after "_": the content hash
+CONTENT_HASH_PATTERN = re.compile(r"(?:^|_)([0-9a-f]{16,64})[_.]")
+
+
+def content_hash_from_name(filename: str) -> Optional[str]:
+    match = CONTENT_HASH_PATTERN.search(filename)
+    return match.group(1) if match else None
+
+
+class CacheControlledStaticFiles(PrecompressedStaticFiles):
+    def __init__(self, *args, digest_cache_size: int = 4096, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (path, mtime_ns, size) -> sha256 for files without a hash in their name
+        self._digests: dict = {}
+        self._digest_cache_size = digest_cache_size
+
+    def lookup_path(self, path: str):
+        # runs in a worker thread: hash legacy files here, not on the event loop
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is not None and stat.S_ISREG(stat_result.st_mode) \
+                and not content_hash_from_name(os.path.basename(full_path)):
+            self._file_digest(full_path, stat_result)
+        return full_path, stat_result
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        content_hash = content_hash_from_name(os.path.basename(full_path))
+        if content_hash:
+            headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": f'"{content_hash}"'}
+        else:
+            digest = self._file_digest(str(full_path), stat_result)
+            headers = {"Cache-Control": REVALIDATE_CACHE_CONTROL, "ETag": f'"{digest}"'}
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _file_digest(self, path: str, stat_result: os.stat_result) -> str:
+        key = (path, stat_result.st_mtime_ns, stat_result.st_size)
+        digest = self._digests.get(key)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()[:32]
+            if len(self._digests) >= self._digest_cache_size:
+                self._digests.clear()
+            self._digests[key] = digest
+        return digest
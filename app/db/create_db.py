@@ -1,29 +1,57 @@
+from pathlib import Path
+
 from sqlalchemy import create_engine, text
-from urllib.parse import urlparse
+from sqlalchemy.engine import URL, make_url
 from app.core.config import DATABASE_URL
+from app.db.sqlite import tune_sqlite
+
+
+def create_database_if_not_exists(url: str = DATABASE_URL):
+    """Create the database if it doesn't exist (MySQL / PostgreSQL database, or a SQLite file)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+
+    if backend == "sqlite":
+        _create_sqlite_database(parsed)
+    elif backend == "mysql":
+        server_url = URL.create(parsed.drivername, parsed.username, parsed.password,
+                                parsed.host, parsed.port, query=parsed.query)
+        _create_server_database(parsed, server_url, "CREATE DATABASE IF NOT EXISTS `{}`")
+    elif backend == "postgresql":
+        # no IF NOT EXISTS for CREATE DATABASE; check the catalog first
+        _create_server_database(
+            parsed, parsed.set(database="postgres"), 'CREATE DATABASE "{}"',
+            exists="SELECT 1 FROM pg_database WHERE datname = :name",
+        )
+    # anything else is expected to exist already
 
 
-def create_database_if_not_exists():
-    """Create the database if it doesn't exist."""
-    # Parse the DATABASE_URL to extract components
-    parsed = urlparse(DATABASE_URL.replace("mysql+pymysql://", "mysql://"))
-    
-    # Extract database name (last part of path)
-    database_name = parsed.path.lstrip('/')
-    
-    # Create a connection URL without the database name
-    # Reconstruct the base connection URL
-    base_url = f"mysql+pymysql://{parsed.netloc}/"
-    
+def _create_server_database(parsed: URL, server_url: URL, create: str, exists: str | None = None):
+    database_name = parsed.database
+    if not database_name:
+        return
+
     # Create engine without database
-    engine = create_engine(base_url, echo=False)
-    
-    # Create database if it doesn't exist
-    with engine.connect() as conn:
-        # Use raw SQL to create database if not exists
-        # DDL statements in SQLAlchemy 2.0 need autocommit
-        conn.execute(text(f"CREATE DATABASE IF NOT EXISTS `{database_name}`"))
-        conn.commit()
-    
-    engine.dispose()
+    engine = create_engine(server_url, echo=False, isolation_level="AUTOCOMMIT")
+    try:
+        # DDL like CREATE DATABASE can't run inside a transaction on every server, hence AUTOCOMMIT
+        with engine.connect() as conn:
+            if exists and conn.execute(text(exists), {"name": database_name}).first():
+                return
+            conn.execute(text(create.format(database_name)))
+    finally:
+        engine.dispose()
+
+
+def _create_sqlite_database(parsed: URL):
+    if parsed.database in (None, "", ":memory:"):
+        return
+    Path(parsed.database).expanduser().parent.mkdir(parents=True, exist_ok=True)
 
+    # opening the file creates it; WAL, once set, is stored in the file itself
+    engine = tune_sqlite(create_engine(parsed.set(drivername="sqlite"), echo=False))
+    try:
+        with engine.connect():
+            pass
+    finally:
+        engine.dispose()
@@ -20,19 +20,45 @@
 #     finally:
 #         db.close()
 
+from typing import Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.core.config import DATABASE_URL
+from app.core.config import ASYNC_DATABASE_URL, DATABASE_URL, READ_REPLICA_URLS, REPLICA_MAX_LAG_SECONDS
 from app.db.base import Base  # single shared Base for all models
+from app.db.replicas import ReplicaSet, request_replica
+from app.db.sqlite import tune_sqlite
+
+__all__ = [
+    "engine", "SessionLocal", "Base", "get_db", "get_primary_db", "read_session",
+    "async_engine", "AsyncSessionLocal", "get_async_db", "replicas",
+]
+
+# sync driver -> asyncio driver for the same database
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
 
-__all__ = ["engine", "SessionLocal", "Base", "get_db"]
+def async_database_url(url: str) -> Optional[str]:
+    """DATABASE_URL with its driver swapped for the asyncio one; None if none is known (e.g. PostgreSQL)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        return None
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
 
 # Engine used across the app
-engine = create_engine(
+engine = tune_sqlite(create_engine(
     DATABASE_URL,
     echo=True,   # show SQL emitted; set False to silence
     future=True
-)
+))
 
 # Session factory
 SessionLocal = sessionmaker(
@@ -43,9 +69,69 @@ SessionLocal = sessionmaker(
 )
 
 def get_db():
-    """Provide a scoped Session dependency."""
+    """Provide a scoped Session dependency (on the request's read replica for GET requests)."""
+    db = _routed_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_primary_db():
+    """get_db that never reads from a replica, for reads that can't be stale."""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Async engine for `async def` endpoints: waiting on the database suspends
+# the request instead of holding a threadpool thread for the whole query.
+# None when DATABASE_URL has no known async driver and ASYNC_DATABASE_URL is
+# unset; the sync endpoints don't need it.
+_async_url = ASYNC_DATABASE_URL or async_database_url(DATABASE_URL)
+async_engine: Optional[AsyncEngine] = create_async_engine(
+    _async_url,
+    echo=True,   # show SQL emitted; set False to silence
+) if _async_url else None
+if async_engine is not None:
+    tune_sqlite(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    # objects stay readable after commit without another (awaited) load
+    expire_on_commit=False,
+)
+
+
+async def get_async_db():
+    """Provide an AsyncSession dependency (on the request's read replica for GET requests)."""
+    replica = request_replica()
+    bind = replica.async_engine if replica and replica.async_engine else async_engine
+    if bind is None:
+        raise RuntimeError(f"No async driver known for {make_url(DATABASE_URL).drivername}; set ASYNC_DATABASE_URL")
+    async with AsyncSessionLocal(bind=bind) as db:
+        yield db
+
+
+# Read replicas (READ_REPLICA_URLS); empty unless configured. See app/db/replicas.py
+replicas = ReplicaSet(
+    READ_REPLICA_URLS,
+    async_url=async_database_url,
+    max_lag_seconds=REPLICA_MAX_LAG_SECONDS,
+    echo=engine.echo,
+)
+
+
+def read_session():
+    """Session on a replica for report jobs that can live with its lag: `with read_session() as db:`."""
+    replica = replicas.pick()
+    return SessionLocal(bind=replica.engine) if replica else SessionLocal()
+
+
+def _routed_session():
+    replica = request_replica()
+    return SessionLocal(bind=replica.engine) if replica else SessionLocal()
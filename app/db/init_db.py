@@ -1,5 +1,5 @@
 
-from session import engine
+from app.db.database import engine
 from app.db.create_db import create_database_if_not_exists
 
 def init_db():
@@ -0,0 +1,47 @@
+"""
+Database advisory locks.
+
+Used for leader election between several API workers: whoever gets the
+lock runs the job, everybody else skips that tick. The lock is tied to the
+connection, so it is released even if the worker dies mid-run.
+
+- MySQL:      GET_LOCK / RELEASE_LOCK
+- PostgreSQL: pg_try_advisory_lock / pg_advisory_unlock
+- SQLite:     single process database file, so no lock is needed
+"""
+
+import zlib
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from app.db.database import engine
+
+
+@contextmanager
+def advisory_lock(name: str):
+    """
+    Try to take a named advisory lock without waiting.
+
+    Yields True if this worker holds the lock (and should do the work),
+    False if another worker already holds it.
+    """
+    dialect = engine.dialect.name
+    if dialect not in ("mysql", "postgresql"):
+        yield True
+        return
+
+    with engine.connect() as conn:
+        if dialect == "mysql":
+            acquired = conn.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": name}).scalar() == 1
+        else:
+            key = zlib.crc32(name.encode("utf-8"))
+            acquired = bool(conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar())
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                if dialect == "mysql":
+                    conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+                else:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
@@ -0,0 +1,148 @@
+"""
+Read replicas.
+
+With READ_REPLICA_URLS set, each GET request is assigned one replica,
+round-robin among the healthy ones, and every get_db / get_async_db
+session it opens (the principal lookup included) reads from that replica.
+Writes, background jobs and anything outside a GET request stay on the
+primary. Report-style jobs opt in with read_session(), or with
+replica_reads(replicas.pick()) around code that uses get_db.
+
+A replica is taken out of rotation when the health check can't reach it,
+when it lags the primary by more than REPLICA_MAX_LAG_SECONDS (MySQL
+only), or when a query on it loses its connection. With no healthy
+replica, reads go to the primary.
+
+Read-your-writes: after a user writes, their reads stay on the primary
+for READ_YOUR_WRITES_SECONDS (see app/core/read_routing.py).
+"""
+
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.sqlite import tune_sqlite
+
+# Replica the current request (or job) reads from; None: the primary
+_read_replica: ContextVar[Optional["Replica"]] = ContextVar("read_replica", default=None)
+
+
+def request_replica() -> Optional["Replica"]:
+    """The replica get_db / get_async_db should open sessions on, if any."""
+    replica = _read_replica.get()
+    # taken out of rotation since the request started
+    return replica if replica is not None and replica.healthy else None
+
+
+def reading_from_replica() -> bool:
+    return request_replica() is not None
+
+
+@contextmanager
+def replica_reads(replica: Optional["Replica"]):
+    """Route get_db / get_async_db sessions opened inside the block to `replica` (None: the primary)."""
+    token = _read_replica.set(replica)
+    try:
+        yield
+    finally:
+        _read_replica.reset(token)
+
+
+class Replica:
+    def __init__(self, url: str, async_url: Optional[str], echo: bool):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = tune_sqlite(create_engine(url, echo=echo, future=True, pool_pre_ping=True))
+        # None without a known async driver: get_async_db then reads from the primary
+        self.async_engine = create_async_engine(async_url, echo=echo, pool_pre_ping=True) if async_url else None
+        self.healthy = True
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        event.listen(self.engine, "handle_error", self._on_error)
+        if self.async_engine is not None:
+            tune_sqlite(self.async_engine.sync_engine)
+            event.listen(self.async_engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        # unreachable or lost mid-query: stop sending reads here until the next check passes
+        if context.is_disconnect or context.connection is None:
+            _set_health(self, False, str(context.original_exception))
+
+
+class ReplicaSet:
+    def __init__(self, urls: List[str], async_url, max_lag_seconds: float, echo: bool = False):
+        self.max_lag_seconds = max_lag_seconds
+        self.replicas = [Replica(url, async_url(url), echo) for url in urls]
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[Replica]:
+        """Next healthy replica, round-robin; None if there is none."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        with self._lock:
+            turn = next(self._next)
+        return healthy[turn % len(healthy)]
+
+    def check(self):
+        """Scheduler job: ping every replica and measure its lag."""
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                    replica.lag_seconds = _replication_lag(conn)
+            except Exception as e:
+                _set_health(replica, False, str(e))
+                continue
+            if replica.lag_seconds is not None and replica.lag_seconds > self.max_lag_seconds:
+                _set_health(replica, False, f"{replica.lag_seconds:.0f}s behind the primary")
+            else:
+                _set_health(replica, True, None)
+
+    def status(self) -> List[dict]:
+        return [
+            {"replica": r.name, "healthy": r.healthy, "lag_seconds": r.lag_seconds, "error": r.error}
+            for r in self.replicas
+        ]
+
+    async def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+
+
+def _set_health(replica: Replica, healthy: bool, error: Optional[str]):
+    if healthy and not replica.healthy:
+        print(f"✅ Read replica {replica.name} is back in rotation")
+    elif not healthy and replica.healthy:
+        print(f"⚠️  Read replica {replica.name} taken out of rotation: {error}")
+    replica.healthy, replica.error = healthy, error
+
+
+def _replication_lag(conn) -> Optional[float]:
+    """Seconds behind the primary, or None where it can't be told (SQLite, missing privilege)."""
+    if conn.dialect.name != "mysql":
+        return None
+    for statement, column in (("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+                              ("SHOW SLAVE STATUS", "Seconds_Behind_Master")):
+        try:
+            row = conn.execute(text(statement)).mappings().first()
+        except Exception:
+            conn.rollback()
+            continue
+        if row is None:
+            return None  # not a replica (a stand-in, or a second primary)
+        lag = row.get(column)
+        # NULL: replication is stopped, so the data is as stale as it gets
+        return float("inf") if lag is None else float(lag)
+    return None
@@ -0,0 +1,62 @@
+"""
+SQLite deployment profile.
+
+Single-site gyms can run on a SQLite file instead of MySQL
+(DB_PROFILE=sqlite, or any sqlite:// DATABASE_URL). Every connection an
+engine opens gets these pragmas, on the sync, async and replica engines
+alike:
+
+- journal_mode=WAL: readers don't block the writer, and the writer
+  doesn't block readers, across API workers too
+- synchronous=NORMAL: in WAL mode a power cut can lose the last commits
+  but never corrupts the file; no fsync on every commit
+- mmap_size / cache_size: hot pages are read from memory instead of
+  through read() calls
+- busy_timeout: a writer waits for the lock instead of failing with
+  "database is locked"
+- foreign_keys=ON: enforce the same constraints and ON DELETE CASCADE as
+  MySQL does
+- temp_store=MEMORY: sorts and temporary indexes stay off the disk
+
+All of them can be tuned through the SQLITE_* settings in app/core/config.py.
+"""
+
+from typing import List
+
+from sqlalchemy import event
+
+from app.core.config import (
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
+)
+
+
+def sqlite_pragmas() -> List[str]:
+    return [
+        f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",  # negative: KiB rather than pages
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA foreign_keys=ON",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def tune_sqlite(engine):
+    """Apply the profile's pragmas to every new connection of a SQLite engine; no-op for other databases."""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _apply_pragmas)
+    return engine
@@ -44,15 +44,40 @@
 # def greet():
 #     return {"message": "Dojo Fitness API running 🚀"}
 
+import asyncio
 import sys
 from pathlib import Path
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
-from app.db.database import Base, engine
+from app.core.config import (
+    ATTENDANCE_AUTOCLOSE_ENABLED,
+    ATTENDANCE_AUTOCLOSE_INTERVAL_SECONDS,
+    ATTENDANCE_STREAM_POLL_SECONDS,
+    COMPRESSION_ENABLED,
+    COMPRESSION_MINIMUM_SIZE,
+    GZIP_LEVEL,
+    BROTLI_QUALITY,
+    MAX_IMAGE_UPLOAD_BYTES,
+    IDEMPOTENCY_TTL_SECONDS,
+    IDEMPOTENCY_CACHE_SIZE,
+    IDEMPOTENCY_LOCK_SECONDS,
+    IDEMPOTENCY_WAIT_SECONDS,
+    IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS,
+    READ_YOUR_WRITES_SECONDS,
+    REPLICA_HEALTH_CHECK_SECONDS,
+)
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.idempotency import IdempotencyMiddleware, IdempotencyStore, purge_expired_idempotency_keys
+from app.core.read_routing import PRIMARY_UNTIL_HEADER, ReadRoutingMiddleware
+from app.core.static_files import CacheControlledStaticFiles
+from app.core.scheduler import scheduler
+from app.db.database import Base, async_engine, engine, replicas
+from app.utils.attendance import close_stale_sessions, poll_attendance_changes
+from app.utils.images import shutdown_image_pool
 from app.models import members  # ensure models are registered before create_all
 from app.api import auth
 from app.api import admin
@@ -64,6 +89,7 @@ from app.api import trainers_profile
 from app.api import queries
 from app.api import workout
 from app.api import fitness_checkups
+from app.api import dashboard
 
 # ---------- AUTH TOKEN SCHEME FOR SWAGGER ----------
 security = HTTPBearer()
@@ -84,7 +110,21 @@ if str(project_root) not in sys.path:
 async def lifespan(app: FastAPI):
     print("🚀 Starting API — creating tables if not exists…")
     Base.metadata.create_all(bind=engine)
+    if ATTENDANCE_AUTOCLOSE_ENABLED:
+        scheduler.add_job(close_stale_sessions, ATTENDANCE_AUTOCLOSE_INTERVAL_SECONDS)
+    if ATTENDANCE_STREAM_POLL_SECONDS > 0:
+        scheduler.add_job(poll_attendance_changes, ATTENDANCE_STREAM_POLL_SECONDS)
+    scheduler.add_job(purge_expired_idempotency_keys, IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS)
+    if replicas:
+        await asyncio.to_thread(replicas.check)  # no reads on a dead replica before the first tick
+        scheduler.add_job(replicas.check, REPLICA_HEALTH_CHECK_SECONDS, name="check_replicas")
+    scheduler.start()
     yield
+    await scheduler.stop()
+    shutdown_image_pool()
+    if async_engine is not None:
+        await async_engine.dispose()
+    await replicas.dispose()
     print("🛑 Shutting down API…")
 
 
@@ -95,6 +135,26 @@ app = FastAPI(
     swagger_ui_parameters={"persistAuthorization": True}
 )
 
+# ---------- IDEMPOTENCY-KEY ----------
+# retried POSTs get the first response replayed; added first so it runs
+# innermost and replays still pass through CORS and compression
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=IdempotencyStore(
+        ttl_seconds=IDEMPOTENCY_TTL_SECONDS,
+        cache_size=IDEMPOTENCY_CACHE_SIZE,
+        lock_seconds=IDEMPOTENCY_LOCK_SECONDS,
+        wait_seconds=IDEMPOTENCY_WAIT_SECONDS,
+    ),
+    exclude_paths=("/auth/",),
+)
+
+# ---------- READ REPLICAS ----------
+# GET requests read from READ_REPLICA_URLS; outside idempotency so replayed
+# writes also renew the writer's read-your-writes window
+if replicas:
+    app.add_middleware(ReadRoutingMiddleware, replicas=replicas, sticky_seconds=READ_YOUR_WRITES_SECONDS)
+
 # ---------- CORS MIDDLEWARE ----------
 # Allow frontend to make requests from localhost:5173
 app.add_middleware(
@@ -108,6 +168,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # read-your-writes window, echoed back by the frontend (app/core/read_routing.py)
+    expose_headers=[PRIMARY_UNTIL_HEADER],
+)
+
+# ---------- COMPRESSION MIDDLEWARE ----------
+# brotli/gzip for JSON responses; /uploads serves its own cached variants
+if COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=COMPRESSION_MINIMUM_SIZE,
+        gzip_level=GZIP_LEVEL,
+        brotli_quality=BROTLI_QUALITY,
+        exclude_paths=("/uploads",),
+    )
+
+# ---------- UPLOAD SIZE LIMIT ----------
+# cut oversized photo uploads off while they stream in, not after spooling
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=MAX_IMAGE_UPLOAD_BYTES,
+    path_pattern=r"^/members/\d+/image$",
 )
 
 # ---------- ROUTES ----------
@@ -144,12 +225,26 @@ app.include_router(workout.router)
 # fitness checkup route
 app.include_router(fitness_checkups.router)
 
+# dashboard counters
+app.include_router(dashboard.router)
+
 # ---------- STATIC FILE SERVING ----------
 # Serve uploaded files (images, documents, etc.)
+# content-hashed photos are cached for a year; see app/core/static_files.py
 from pathlib import Path
 uploads_path = Path(__file__).parent.parent / "uploads"
 uploads_path.mkdir(exist_ok=True)  # Create uploads dir if it doesn't exist
-app.mount("/uploads", StaticFiles(directory=str(uploads_path)), name="uploads")
+app.mount(
+    "/uploads",
+    CacheControlledStaticFiles(
+        directory=str(uploads_path),
+        cache_dir=str(Path(__file__).parent.parent / ".cache" / "uploads"),
+        minimum_size=COMPRESSION_MINIMUM_SIZE,
+        gzip_level=GZIP_LEVEL,
+        brotli_quality=BROTLI_QUALITY,
+    ),
+    name="uploads",
+)
 
 # ---------- TEST ROUTE ----------
 @app.get("/")
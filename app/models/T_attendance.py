@@ -1,17 +1,24 @@
 # app/models/trainer_attendance.py
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index, Boolean, false
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.db.base import Base 
 
 class TrainerAttendance(Base):
     __tablename__ = "trainer_attendance"
+    __table_args__ = (
+        # keyset pagination: per-trainer history and the global list
+        Index("ix_trainer_attendance_trainer_check_in", "trainer_id", "check_in"),
+        Index("ix_trainer_attendance_check_in_id", "check_in", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     trainer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     check_in = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
     check_out = Column(DateTime(timezone=True), nullable=True)
+    # set when the stale-session job closed this row instead of a real checkout
+    auto_closed = Column(Boolean, nullable=False, default=False, server_default=false())
 
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
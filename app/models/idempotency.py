@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, LargeBinary, DateTime, Index
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Response stored for an Idempotency-Key so a retried POST is replayed
+    instead of run twice. status_code is NULL while the first request is
+    still running (locked_at says since when).
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # TTL cleanup
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    # sha256 of user + method + path + the client's key
+    key = Column(String(64), primary_key=True)
+    # sha256 of the request body; the same key with another body is rejected
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    headers = Column(Text, nullable=True)  # JSON [[name, value], ...]
+    body = Column(LargeBinary(length=16 * 1024 * 1024), nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
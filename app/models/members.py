@@ -1,10 +1,16 @@
-from sqlalchemy import Integer,String,Column,DateTime
+from sqlalchemy import Integer,String,Column,DateTime,Index
+from sqlalchemy.sql import func
 from datetime import datetime,timezone
 from sqlalchemy import Date  # Needed for membership_start and membership_end columns
 from app.db.base import Base
+from app.utils.images import variant_urls
 
 class Member(Base):
     __tablename__ = "members"
+    __table_args__ = (
+        # /members/changes?since= range scans
+        Index("ix_members_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50), nullable=False)
@@ -23,4 +29,26 @@ class Member(Base):
     next_fitness_checkup_date = Column(Date, nullable=True)
     
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    # database clock, so /members/changes watermarks compare against it
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # bumped by every ORM update; ETags and If-Match checks are based on it
+    row_version = Column(Integer, nullable=False, default=1, server_default="1")
 
+    __mapper_args__ = {"version_id_col": row_version}
+
+    @property
+    def image_variants(self):
+        """{"thumb", "card", "full"} -> URL, derived from image_url."""
+        return variant_urls(self.image_url)
+
+
+class MemberTombstone(Base):
+    """Remembers deleted members so /members/changes clients can drop them."""
+    __tablename__ = "member_tombstones"
+    __table_args__ = (
+        Index("ix_member_tombstones_deleted_at", "deleted_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    member_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class StoredObject(Base):
+    """
+    Reference count of a content-addressed blob in the storage backend.
+
+    Identical uploads map to the same key and are stored once; the blob is
+    deleted when the last reference goes away.
+    """
+    __tablename__ = "stored_objects"
+
+    key = Column(String(255), primary_key=True)
+    refcount = Column(Integer, nullable=False, default=0)
+    size = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
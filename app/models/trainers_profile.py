@@ -21,5 +21,9 @@ class TrainerProfile(Base):
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc),
                         onupdate=lambda: datetime.now(timezone.utc))
+    # bumped by every ORM update; ETags and If-Match checks are based on it
+    row_version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": row_version}
 
     user = relationship("User", backref="trainer_profile", uselist=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -6,6 +6,14 @@ from app.db.database import Base
 
 class Workout(Base):
     __tablename__ = "workouts"
+    __table_args__ = (
+        # per-member history and /workouts/stats range scans
+        Index("ix_workouts_user_date", "user_id", "date"),
+        Index("ix_workouts_user_created_at", "user_id", "created_at"),
+        # delta sync: changes since a watermark, idempotent client ids
+        Index("ix_workouts_user_updated_at", "user_id", "updated_at"),
+        UniqueConstraint("user_id", "client_id", name="uq_workouts_user_client_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -19,6 +27,9 @@ class Workout(Base):
 
     notes = Column(Text, nullable=True)
 
+    # id generated by an offline client, so re-sending the same change is a no-op
+    client_id = Column(String(64), nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True),
@@ -27,3 +38,18 @@ class Workout(Base):
     )
 
     user = relationship("User", back_populates="workouts")
+
+
+class WorkoutTombstone(Base):
+    """Remembers deleted workouts so offline clients can sync the deletion."""
+    __tablename__ = "workout_tombstones"
+    __table_args__ = (
+        Index("ix_workout_tombstones_user_deleted_at", "user_id", "deleted_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    workout_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    client_id = Column(String(64), nullable=True)
+
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
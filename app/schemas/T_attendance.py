@@ -1,7 +1,7 @@
 # app/schemas/trainer_attendance.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime, date
-from typing import Optional
+from typing import Literal, Optional
 
 class TrainerAttendanceCreate(BaseModel):
     # trainer_id is optional if the current user is a trainer (they can omit it)
@@ -14,7 +14,44 @@ class TrainerAttendanceOut(BaseModel):
     trainer_id: int
     check_in: datetime
     check_out: Optional[datetime] = None
+    auto_closed: bool = False
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class TrainerAttendancePage(BaseModel):
+    items: list[TrainerAttendanceOut]
+    # pass back as ?cursor= to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class CoverageHeatmapOut(BaseModel):
+    start_date: date
+    end_date: date
+    # row labels for matrix (Monday first); columns are hours 0-23 UTC
+    days: list[str]
+    # average number of trainers on the floor, 7 rows x 24 columns
+    matrix: list[list[float]]
+
+
+class BatchAttendanceEntry(BaseModel):
+    trainer_id: int
+    action: Literal["checkin", "checkout"]
+
+
+class BatchAttendanceRequest(BaseModel):
+    entries: list[BatchAttendanceEntry] = Field(..., min_length=1, max_length=100)
+
+
+class BatchAttendanceResult(BaseModel):
+    trainer_id: int
+    action: str
+    success: bool
+    detail: Optional[str] = None
+    attendance: Optional[TrainerAttendanceOut] = None
+
+
+class BatchAttendanceOut(BaseModel):
+    results: list[BatchAttendanceResult]
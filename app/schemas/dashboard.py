@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class DashboardSummary(BaseModel):
+    total_members: int
+    # membership_end today or later
+    active_members: int
+    # due today or overdue / due within the next 2 days
+    checkups_due_today: int
+    checkups_due_soon: int
+    # open attendance sessions right now
+    trainers_on_floor: int
+    leads_by_status: dict[str, int]
+    new_leads_this_week: int
+    # final_price of plans assigned since Monday
+    revenue_this_week: float
+    # when the counters were computed (they are cached briefly)
+    generated_at: datetime
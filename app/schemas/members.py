@@ -28,6 +28,60 @@ class MemberUpdate(MemberBase):
 class MemberOut(MemberBase):
     id: int
     created_at: datetime
+    updated_at: datetime | None = None
+    # thumb / card / full URLs; None when there is no image or it predates variants
+    image_variants: dict[str, str] | None = None
 
     class Config:
         from_attributes = True
+
+
+class MemberTombstoneOut(BaseModel):
+    id: int
+    deleted_at: datetime
+
+
+class MemberChangesOut(BaseModel):
+    # send this back as `since` next time
+    watermark: datetime
+    members: list[MemberOut]
+    deleted: list[MemberTombstoneOut]
+
+
+class MemberBulkFilter(BaseModel):
+    """Conditions are ANDed; at least one is required."""
+    membership_type: str | None = None
+    gender: str | None = None
+    membership_end_before: date | None = None
+    membership_end_after: date | None = None
+    created_before: datetime | None = None
+
+    class Config:
+        extra = "forbid"
+
+
+class MemberBulkSelection(BaseModel):
+    # exactly one of ids / filter
+    ids: list[int] | None = None
+    filter: MemberBulkFilter | None = None
+
+
+class MemberBulkChanges(BaseModel):
+    """Fields that can be set on many members at once (not name/phone)."""
+    membership_type: str | None = None
+    membership_start: date | None = None
+    membership_end: date | None = None
+    last_fitness_checkup_date: date | None = None
+    next_fitness_checkup_date: date | None = None
+
+    class Config:
+        extra = "forbid"
+
+
+class MemberBulkUpdate(MemberBulkSelection):
+    changes: MemberBulkChanges
+
+
+class MemberBulkResult(BaseModel):
+    updated: int = 0
+    deleted: int = 0
@@ -1,11 +1,15 @@
+import datetime as dt
 from datetime import date, datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# Fields named "date" use dt.date: inside the class body the bare name
+# would resolve to the field's own default (None) instead of the type.
 
 class WorkoutBase(BaseModel):
     name: str
     description: Optional[str] = None
-    date: Optional[date] = None
+    date: Optional[dt.date] = None
     duration: Optional[int] = None
     calories: Optional[int] = None
     notes: Optional[str] = None
@@ -18,7 +22,7 @@ class WorkoutCreate(WorkoutBase):
 class WorkoutUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
-    date: Optional[date] = None
+    date: Optional[dt.date] = None
     duration: Optional[int] = None
     calories: Optional[int] = None
     notes: Optional[str] = None
@@ -26,7 +30,92 @@ class WorkoutUpdate(BaseModel):
 
 class WorkoutOut(WorkoutBase):
     id: int
+    client_id: Optional[str] = None
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+class WorkoutListItem(BaseModel):
+    # every field optional so ?fields= can return a sparse subset
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    date: Optional[dt.date] = None
+    duration: Optional[int] = None
+    calories: Optional[int] = None
+    notes: Optional[str] = None
+    client_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class WorkoutPage(BaseModel):
+    workouts: list[WorkoutListItem]
+    # pass back as ?cursor= to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+# ---------------- DELTA SYNC ----------------
+class WorkoutSyncChange(WorkoutUpdate):
+    # generated on the device; the same client_id is only ever applied once
+    client_id: str = Field(..., min_length=1, max_length=64)
+    # server id, for editing a workout that was created online (no client_id yet)
+    id: Optional[int] = None
+    deleted: bool = False
+
+
+class WorkoutSyncRequest(BaseModel):
+    # watermark returned by the previous sync; omit for a full download
+    since: Optional[datetime] = None
+    changes: list[WorkoutSyncChange] = Field(default_factory=list, max_length=500)
+
+
+class WorkoutSyncApplied(BaseModel):
+    client_id: str
+    id: Optional[int] = None
+    status: str  # created / updated / deleted / missing / invalid
+
+
+class WorkoutTombstoneOut(BaseModel):
+    id: int
+    client_id: Optional[str] = None
+    deleted_at: datetime
+
+
+class WorkoutSyncOut(BaseModel):
+    # send this back as `since` next time
+    watermark: datetime
+    applied: list[WorkoutSyncApplied]
+    workouts: list[WorkoutOut]
+    deleted: list[WorkoutTombstoneOut]
+
+
+class WorkoutStatsBucket(BaseModel):
+    period_start: date
+    workouts: int
+    total_duration: int
+    total_calories: int
+    avg_duration: Optional[float] = None
+    avg_calories: Optional[float] = None
+
+
+class WorkoutPersonalBest(BaseModel):
+    workout_id: int
+    name: str
+    date: Optional[dt.date] = None
+    value: int
+
+
+class WorkoutStatsOut(BaseModel):
+    granularity: str
+    total_workouts: int
+    total_duration: int
+    total_calories: int
+    current_streak_days: int
+    longest_streak_days: int
+    longest_workout: Optional[WorkoutPersonalBest] = None
+    most_calories: Optional[WorkoutPersonalBest] = None
+    buckets: list[WorkoutStatsBucket]
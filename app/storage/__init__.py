@@ -0,0 +1,133 @@
+"""
+Pluggable, content-addressed, deduplicated storage for uploads.
+
+Backends (STORAGE_BACKEND):
+    local - files under uploads/, served by the /uploads mount (default)
+    s3    - an S3 bucket or S3-compatible store such as MinIO (needs boto3)
+
+Keys are derived from the SHA-256 of the content and fanned out over two
+directory levels ("members/ab/cd/abcd...ef_full.webp"), so no directory
+ends up with 100k entries and the same bytes always land on the same key.
+
+stored_objects keeps a reference count per key: acquire() on use,
+release() when a row stops pointing at the blob; blobs whose count drops
+to zero are purged after the commit.
+"""
+
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Iterable, List
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    STORAGE_BACKEND,
+    STORAGE_LOCAL_ROOT,
+    S3_BUCKET,
+    S3_ENDPOINT_URL,
+    S3_PUBLIC_URL,
+    S3_REGION,
+)
+from app.db.database import SessionLocal
+from app.models.storage import StoredObject
+from app.storage.base import Storage
+from app.storage.local import LocalStorage
+from app.storage.s3 import S3Storage
+
+__all__ = ["Storage", "LocalStorage", "S3Storage", "get_storage", "content_key", "acquire", "release", "purge"]
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> Storage:
+    if STORAGE_BACKEND == "s3":
+        return S3Storage(S3_BUCKET, S3_PUBLIC_URL, endpoint_url=S3_ENDPOINT_URL, region=S3_REGION)
+    if STORAGE_BACKEND == "local":
+        return LocalStorage(STORAGE_LOCAL_ROOT)
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+
+def content_key(namespace: str, digest: str, suffix: str = "") -> str:
+    """Fan-out key for a content digest: namespace/ab/cd/<digest><suffix>."""
+    return f"{namespace}/{digest[:2]}/{digest[2:4]}/{digest}{suffix}"
+
+
+def acquire(db: Session, keys: Iterable[str]):
+    """Add one reference to each key (part of the caller's transaction)."""
+    for key in keys:
+        updated = db.execute(
+            update(StoredObject).where(StoredObject.key == key).values(refcount=StoredObject.refcount + 1)
+        ).rowcount
+        if updated:
+            continue
+        try:
+            with db.begin_nested():
+                db.add(StoredObject(key=key, refcount=1))
+        except IntegrityError:
+            # another request inserted it first
+            db.execute(
+                update(StoredObject).where(StoredObject.key == key).values(refcount=StoredObject.refcount + 1)
+            )
+
+
+# keys per IN (...) list, well below every driver's bound-parameter limit
+RELEASE_CHUNK_SIZE = 500
+
+
+def release(db: Session, keys: Iterable[str], chunk_size: int = RELEASE_CHUNK_SIZE) -> List[str]:
+    """
+    Drop one reference per occurrence of each key (part of the caller's transaction).
+    A key listed twice, e.g. a photo shared by two deleted members, loses two.
+
+    Returns the keys to purge after commit: those whose count reached zero,
+    plus keys that were never counted (files stored before refcounting,
+    which belonged to a single member).
+    """
+    occurrences = Counter(keys)
+    if not occurrences:
+        return []
+    by_count = defaultdict(list)
+    for key, n in occurrences.items():
+        by_count[n].append(key)
+    for n, group in by_count.items():
+        for chunk in _chunks(group, chunk_size):
+            db.execute(
+                update(StoredObject).where(StoredObject.key.in_(chunk)).values(refcount=StoredObject.refcount - n)
+            )
+
+    unique = list(occurrences)
+    counts = {}
+    for chunk in _chunks(unique, chunk_size):
+        counts.update(db.query(StoredObject.key, StoredObject.refcount).filter(StoredObject.key.in_(chunk)).all())
+    orphaned = [key for key in unique if counts.get(key, 0) <= 0]
+    for chunk in _chunks(orphaned, chunk_size):
+        db.query(StoredObject).filter(StoredObject.key.in_(chunk)).delete(synchronize_session=False)
+    return orphaned
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def purge(keys: Iterable[str]):
+    """
+    Delete released blobs from storage; runs as a background task.
+
+    A key re-acquired since release() (the same photo uploaded again) has a
+    stored_objects row again and is kept.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    with SessionLocal() as db:
+        live = {key for (key,) in db.query(StoredObject.key).filter(StoredObject.key.in_(keys))}
+    storage = get_storage()
+    for key in keys:
+        if key in live:
+            continue
+        try:
+            storage.delete(key)
+        except Exception as e:
+            print(f"Failed to delete stored object {key}: {e}")
@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+
+class Storage(ABC):
+    """
+    Blob storage addressed by key ("members/ab/cd/<sha256>_full.webp").
+
+    Keys are content addressed, so a stored blob never changes: put_file
+    may skip work for a key that exists, and URLs can be cached forever.
+    """
+
+    @abstractmethod
+    def put_file(self, key: str, path: Path, content_type: Optional[str] = None) -> None:
+        """Store a local file under key. The file is consumed (moved or uploaded and removed)."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a blob; a missing key is not an error."""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """URL stored in the database and handed to clients."""
+
+    @abstractmethod
+    def key_from_url(self, url: str) -> Optional[str]:
+        """Inverse of url(); None if the URL does not belong to this storage."""
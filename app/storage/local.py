@@ -0,0 +1,60 @@
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from app.storage.base import Storage
+
+
+class LocalStorage(Storage):
+    """
+    Blobs as files under root, served by the /uploads static mount.
+
+    url_prefix is what image_url has always looked like
+    ("uploads/members/..."), so existing rows and the frontend keep working.
+    """
+
+    def __init__(self, root: str = "uploads", url_prefix: str = "uploads"):
+        self.root = Path(root)
+        self.url_prefix = url_prefix.rstrip("/")
+
+    def path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Key escapes storage root: {key}")
+        return path
+
+    def put_file(self, key: str, path: Path, content_type: Optional[str] = None) -> None:
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(path, target)  # atomic on the same filesystem
+        except OSError:
+            # staging dir on another filesystem: copy next to the target, then rename
+            tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, target)
+            Path(path).unlink(missing_ok=True)
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        path = self.path(key)
+        path.unlink(missing_ok=True)
+        # prune fan-out directories left empty
+        root = self.root.resolve()
+        for parent in path.parents:
+            if parent == root or not parent.is_relative_to(root):
+                break
+            try:
+                parent.rmdir()
+            except OSError:
+                break  # not empty
+
+    def url(self, key: str) -> str:
+        return f"{self.url_prefix}/{key}"
+
+    def key_from_url(self, url: str) -> Optional[str]:
+        prefix = self.url_prefix + "/"
+        return url[len(prefix):] if url.startswith(prefix) else None
@@ -0,0 +1,56 @@
+from pathlib import Path
+from typing import Optional
+
+from app.storage.base import Storage
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+except ImportError:  # optional dependency, only needed for STORAGE_BACKEND=s3
+    boto3 = None
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class S3Storage(Storage):
+    """
+    Blobs in an S3 bucket or any S3-compatible store (MinIO, LocalStack,
+    Ceph...) given endpoint_url. public_url is the base clients download
+    from, e.g. a CDN in front of the bucket.
+    """
+
+    def __init__(self, bucket: str, public_url: str, endpoint_url: Optional[str] = None,
+                 region: Optional[str] = None, client=None):
+        if client is None:
+            if boto3 is None:
+                raise RuntimeError("STORAGE_BACKEND=s3 requires the boto3 package")
+            client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self.client = client
+        self.bucket = bucket
+        self.public_url = public_url.rstrip("/")
+
+    def put_file(self, key: str, path: Path, content_type: Optional[str] = None) -> None:
+        extra = {"CacheControl": IMMUTABLE_CACHE_CONTROL}
+        if content_type:
+            extra["ContentType"] = content_type
+        self.client.upload_file(str(path), self.bucket, key, ExtraArgs=extra)
+        Path(path).unlink(missing_ok=True)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+    def key_from_url(self, url: str) -> Optional[str]:
+        prefix = self.public_url + "/"
+        return url[len(prefix):] if url.startswith(prefix) else None
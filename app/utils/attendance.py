@@ -0,0 +1,132 @@
+"""
+Trainer attendance background jobs.
+
+close_stale_sessions() closes sessions whose trainer forgot to check out.
+It runs on the in-process scheduler (see app/main.py) and uses a database
+advisory lock so that only one API worker does the work each tick.
+
+poll_attendance_changes() is the multi-worker fallback for the live
+attendance stream: it republishes check-ins/checkouts written by other
+workers to this worker's subscribers.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import literal_column, update, func, or_
+
+from app.core.config import ATTENDANCE_MAX_SESSION_HOURS
+from app.core.events import attendance_events
+from app.db.database import SessionLocal
+from app.db.locks import advisory_lock
+from app.models.T_attendance import TrainerAttendance
+from app.schemas.T_attendance import TrainerAttendanceOut
+
+STALE_SESSION_LOCK = "dojo_fitness:close_stale_sessions"
+
+
+def _capped_check_out(dialect: str, hours: int, fallback: datetime):
+    """
+    SQL expression for check_in + hours, so the closed session is billed
+    for at most the configured maximum instead of until the job noticed it.
+    """
+    if dialect == "mysql":
+        return func.timestampadd(literal_column("HOUR"), hours, TrainerAttendance.check_in)
+    if dialect == "sqlite":
+        return func.datetime(TrainerAttendance.check_in, f"+{hours} hours")
+    if dialect == "postgresql":
+        return TrainerAttendance.check_in + func.make_interval(0, 0, 0, 0, hours)
+    return fallback
+
+
+def close_stale_sessions(max_hours: Optional[int] = None) -> int:
+    """
+    Close every open session older than max_hours in one set-based UPDATE.
+
+    check_out is set to check_in + max_hours and the row is flagged
+    auto_closed so payroll can tell it apart from a real checkout.
+
+    Returns:
+        Number of sessions closed (0 if another worker holds the lock)
+    """
+    max_hours = max_hours or ATTENDANCE_MAX_SESSION_HOURS
+
+    with advisory_lock(STALE_SESSION_LOCK) as is_leader:
+        if not is_leader:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(hours=max_hours)
+
+        db = SessionLocal()
+        try:
+            stmt = (
+                update(TrainerAttendance)
+                .where(
+                    TrainerAttendance.check_out.is_(None),
+                    TrainerAttendance.check_in < cutoff,
+                )
+                .values(
+                    check_out=_capped_check_out(db.get_bind().dialect.name, max_hours, now),
+                    auto_closed=True,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            closed = db.execute(stmt).rowcount
+            db.commit()
+        finally:
+            db.close()
+
+    if closed:
+        print(f"🕒 Auto-closed {closed} stale trainer session(s)")
+    return closed
+
+
+def publish_attendance_event(row):
+    """
+    Push a check-in or checkout of this row to live stream subscribers.
+    Accepts a TrainerAttendance row or an already built TrainerAttendanceOut.
+    """
+    event = "checkout" if row.check_out is not None else "checkin"
+    data = TrainerAttendanceOut.model_validate(row).model_dump(mode="json")
+    attendance_events.publish(event, data, key=f"{event}:{row.id}")
+
+
+_poll_watermark: Optional[datetime] = None
+
+
+def poll_attendance_changes():
+    """
+    Publish attendance rows checked in or out since the previous poll.
+
+    Only hits the database while someone is subscribed. Events this worker
+    already published itself are dropped by the broker's key de-duplication.
+    """
+    global _poll_watermark
+    if not attendance_events.has_subscribers:
+        _poll_watermark = None
+        return
+
+    if _poll_watermark is None:
+        _poll_watermark = datetime.now(timezone.utc)
+        return
+
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(TrainerAttendance)
+            .filter(or_(
+                TrainerAttendance.check_in >= _poll_watermark,
+                TrainerAttendance.check_out >= _poll_watermark,
+            ))
+            .order_by(TrainerAttendance.id.asc())
+            .all()
+        )
+        for row in rows:
+            publish_attendance_event(row)
+            latest = max(filter(None, (row.check_in, row.check_out)))
+            if latest.tzinfo is None:
+                latest = latest.replace(tzinfo=timezone.utc)
+            _poll_watermark = max(_poll_watermark, latest)
+    finally:
+        db.close()
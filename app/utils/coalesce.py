@@ -0,0 +1,193 @@
+"""
+Single-flight request coalescing for expensive read endpoints.
+
+When several receptionists open the app at once, identical reads
+(/members/, /fitness-checkups/due, /trainer-attendance/today) run
+concurrently and each hits the database. With @coalesce, the first
+request runs the endpoint, and identical requests that arrive while it
+runs await the same result instead.
+
+    @router.get("/", response_model=list[MemberOut], dependencies=[...])
+    @coalesce(list[MemberOut])
+    def get_members(db: Session = Depends(get_db)):
+        ...
+
+The leader's result is validated into `response_model` before it is
+shared, while the leader's session is still open. Followers and cache
+hits therefore get plain data, never ORM rows of a session that has
+since been closed. Response objects (e.g. FastJSONResponse) are shared
+as they are.
+
+"Identical" means the same endpoint and the same arguments. The key is
+built from the endpoint's resolved parameters: query and path values,
+pydantic bodies, and rows such as current_user (by id). Sessions,
+Request and BackgroundTasks are left out. An endpoint whose output
+depends on who is asking therefore coalesces per user, as long as it
+takes current_user. Dependencies in `dependencies=[...]` (role checks)
+still run for every request; only the endpoint body is shared.
+
+With ttl > 0, results are also reused for that many seconds (a micro
+cache). Reads can then trail writes by up to ttl, so it is off unless
+asked for.
+
+Endpoints that set headers on an injected Response cannot be coalesced:
+followers would not get the headers.
+
+Counters per endpoint are available from coalescing_stats() and
+GET /admin/metrics/coalescing.
+"""
+
+import asyncio
+import copy
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from fastapi import BackgroundTasks, Request, Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.db.replicas import reading_from_replica
+
+# resolved arguments that say nothing about the result
+_IGNORED_TYPES = (Session, AsyncSession, Request, BackgroundTasks)
+
+
+class SingleFlight:
+    """Runs one computation per key at a time and hands its result to everyone waiting."""
+
+    def __init__(self, name: str, ttl: float = 0.0, max_entries: int = 256):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._cache: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.stats = {"requests": 0, "executions": 0, "coalesced": 0, "cache_hits": 0, "bypassed": 0, "errors": 0}
+        _registry[name] = self
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats["requests"] += 1
+        if self.ttl > 0:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.stats["cache_hits"] += 1
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["executions"] += 1
+            # own task: a client hanging up must not cancel the others' result
+            task = asyncio.ensure_future(self._run(key, compute))
+            self._inflight[key] = task
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await compute()
+        except BaseException:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        if self.ttl > 0:
+            self._cache[key] = (time.monotonic() + self.ttl, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return result
+
+
+_registry: Dict[str, SingleFlight] = {}
+
+
+def coalescing_stats() -> Dict[str, dict]:
+    """{name: counters} for every SingleFlight in this process."""
+    return {name: {"ttl": flight.ttl, **flight.stats} for name, flight in sorted(_registry.items())}
+
+
+def _key_part(value) -> Optional[Hashable]:
+    """Hashable stand-in for an endpoint argument; None if it can't be keyed."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        parts = [_key_part(item) for item in value]
+        if any(part is None and item is not None for part, item in zip(parts, value)):
+            return None
+        return tuple(sorted(parts, key=repr) if isinstance(value, (set, frozenset)) else parts)
+    row_id = getattr(value, "id", None)
+    if row_id is not None and hasattr(value, "__table__"):
+        return (type(value).__name__, row_id)  # current_user and other rows
+    return None
+
+
+def _request_key(kwargs: dict) -> Optional[tuple]:
+    parts = []
+    for name, value in sorted(kwargs.items()):
+        if isinstance(value, _IGNORED_TYPES):
+            continue
+        part = _key_part(value)
+        if part is None and value is not None:
+            return None
+        parts.append((name, part))
+    return tuple(parts)
+
+
+def _private_copy(result):
+    # middlewares edit a response's header list in place; give each caller its own
+    if isinstance(result, Response):
+        result = copy.copy(result)
+        result.raw_headers = list(result.raw_headers)
+    return result
+
+
+def coalesce(response_model: Any, ttl: float = 0.0, name: Optional[str] = None):
+    """Decorator for a route function; put it under the router decorator and pass it the route's response_model."""
+
+    def decorator(func):
+        for param in inspect.signature(func).parameters.values():
+            if param.annotation is Response:
+                raise TypeError(f"{func.__name__} sets headers on Response and cannot be coalesced")
+        flight = SingleFlight(name or f"{func.__module__}.{func.__name__}", ttl=ttl)
+        adapter = TypeAdapter(response_model)
+
+        def detach(result):
+            if isinstance(result, Response):
+                return result
+            # plain dicts and lists, built while the leader's session is open
+            return adapter.dump_python(adapter.validate_python(result, from_attributes=True))
+
+        async def compute(kwargs):
+            if inspect.iscoroutinefunction(func):
+                return detach(await func(**kwargs))
+            # serialize in the same thread: sync sessions are not shared across threads
+            return await run_in_threadpool(lambda: detach(func(**kwargs)))
+
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = _request_key(kwargs)
+            if key is None:
+                flight.stats["bypassed"] += 1
+                return await compute(kwargs)
+            # a user reading their own write must not get a replica's result
+            key = (reading_from_replica(),) + key
+            return _private_copy(await flight.do(key, lambda: compute(kwargs)))
+
+        wrapper.single_flight = flight
+        return wrapper
+
+    return decorator
@@ -0,0 +1,74 @@
+"""
+Trainer floor-coverage heatmap.
+
+Turns check_in/check_out intervals into "average trainers on the floor"
+for each hour of the week (7 x 24, Monday first, UTC).
+
+The work is done with a difference array at minute resolution:
++1 at every check-in minute, -1 at every check-out minute, then a single
+cumulative sum gives the head-count for every minute of the range. All
+steps are numpy array operations, so a year of attendance is a few
+vectorized passes over ~500k integers instead of a Python loop per session.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+MINUTES_PER_HOUR = 60
+HOURS_PER_WEEK = 7 * 24
+
+
+def _to_minutes(values, origin: np.datetime64) -> np.ndarray:
+    """datetimes -> int64 minutes since origin (timezone-aware values are taken as UTC)."""
+    if any(v.tzinfo is not None for v in values):
+        values = [v.astimezone(timezone.utc).replace(tzinfo=None) if v.tzinfo else v for v in values]
+    return (np.array(values, dtype="datetime64[m]") - origin).astype(np.int64)
+
+
+def coverage_heatmap(check_ins, check_outs, start_dt: datetime, end_dt: datetime) -> np.ndarray:
+    """
+    Average number of trainers present per hour of the week.
+
+    Args:
+        check_ins: Sequence of check-in datetimes
+        check_outs: Matching check-out datetimes (None = still open)
+        start_dt: Start of the range (UTC, inclusive, midnight)
+        end_dt: End of the range (UTC, exclusive, midnight)
+
+    Returns:
+        7 x 24 float array, row 0 = Monday, column 0 = 00:00-01:00 UTC
+    """
+    origin = np.datetime64(start_dt.replace(tzinfo=None), "m")
+    total_minutes = int((end_dt - start_dt).total_seconds() // 60)
+    total_hours = total_minutes // MINUTES_PER_HOUR
+
+    if len(check_ins):
+        # open sessions count until the end of the range (or now, if earlier)
+        open_until = min(datetime.now(timezone.utc), end_dt)
+        check_outs = [co if co is not None else open_until for co in check_outs]
+
+        starts = np.clip(_to_minutes(check_ins, origin), 0, total_minutes)
+        ends = np.clip(_to_minutes(check_outs, origin), 0, total_minutes)
+        valid = ends > starts
+        starts, ends = starts[valid], ends[valid]
+
+        diff = (
+            np.bincount(starts, minlength=total_minutes + 1)
+            - np.bincount(ends, minlength=total_minutes + 1)
+        )
+        per_minute = np.cumsum(diff[:total_minutes])
+    else:
+        per_minute = np.zeros(total_minutes, dtype=np.int64)
+
+    # average head-count within each absolute hour of the range
+    per_hour = per_minute.reshape(total_hours, MINUTES_PER_HOUR).mean(axis=1)
+
+    # fold absolute hours onto hour-of-week and average over the weeks seen
+    first_slot = start_dt.weekday() * 24
+    slots = (first_slot + np.arange(total_hours)) % HOURS_PER_WEEK
+    sums = np.bincount(slots, weights=per_hour, minlength=HOURS_PER_WEEK)
+    counts = np.bincount(slots, minlength=HOURS_PER_WEEK)
+    averages = np.divide(sums, counts, out=np.zeros(HOURS_PER_WEEK), where=counts > 0)
+
+    return averages.reshape(7, 24)
@@ -0,0 +1,69 @@
+"""
+ETags and conditional requests for detail endpoints.
+
+ETags are built from a row's version counter (plus anything else the
+response depends on), so they are computed without serializing the body:
+
+- GET with If-None-Match: 304 Not Modified, no body, when it matches
+- PUT with If-Match: 412 Precondition Failed when the row changed since
+  the client read it (optimistic concurrency instead of lost updates)
+
+Rows carry a SQLAlchemy version_id_col, so a concurrent update that slips
+in between the If-Match check and the commit also fails (StaleDataError)
+instead of being overwritten silently.
+"""
+
+import hashlib
+import re
+
+from fastapi import HTTPException, Request, Response
+
+# CompressionMiddleware appends "-br"/"-gzip" to the ETag of compressed bodies
+_ENCODING_SUFFIX = re.compile(r'-(br|gzip)"$')
+
+# detail responses may be stored, but must be revalidated before reuse
+DETAIL_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the values a response depends on."""
+    raw = "|".join(str(part) for part in parts).encode("utf-8")
+    return '"' + hashlib.blake2b(raw, digest_size=12).hexdigest() + '"'
+
+
+def _normalize(tag: str) -> str:
+    return _ENCODING_SUFFIX.sub('"', tag.strip().removeprefix("W/"))
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Does an If-None-Match / If-Match header value match etag?"""
+    if header.strip() == "*":
+        return True
+    return _normalize(etag) in [_normalize(tag) for tag in header.split(",")]
+
+
+def not_modified(request: Request, response: Response, etag: str) -> bool:
+    """
+    Set ETag/Cache-Control on response; True if the client's copy is current
+    and the endpoint should return not_modified_response(response).
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = DETAIL_CACHE_CONTROL
+    header = request.headers.get("if-none-match")
+    return header is not None and etag_matches(header, etag)
+
+
+def check_if_match(request: Request, etag: str):
+    """
+    Raises:
+        412: If-Match was sent and does not match the current ETag
+    """
+    header = request.headers.get("if-match")
+    if header is not None and not etag_matches(header, etag):
+        raise HTTPException(status_code=412, detail="Resource was modified by someone else; reload and retry")
+
+
+def not_modified_response(response: Response) -> Response:
+    return Response(status_code=304, headers={
+        "ETag": response.headers["etag"], "Cache-Control": response.headers["cache-control"],
+    })
@@ -0,0 +1,60 @@
+"""
+Fast JSON path for large list endpoints.
+
+The default FastAPI path loads full ORM objects, validates each one into
+the response_model and then serializes it with the stdlib encoder. For a
+few thousand rows that double conversion dominates the request.
+
+The fast path (enabled with FAST_LIST_RESPONSES=true):
+- selects only the columns the response schema needs (no ORM objects),
+- trusts the database values and skips pydantic re-validation,
+- encodes with orjson when it is installed (stdlib json otherwise).
+
+Returning a Response directly makes FastAPI skip response_model handling,
+so the OpenAPI schema stays the same while the work per row drops.
+See benchmark_list_endpoints.py for the numbers per endpoint.
+"""
+
+import json
+from datetime import date, datetime, timezone
+from typing import Iterable, Sequence
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        # match pydantic: aware UTC datetimes end in "Z"
+        if value.tzinfo is not None and value.utcoffset() == timezone.utc.utcoffset(None):
+            return value.replace(tzinfo=None).isoformat() + "Z"
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def schema_columns(model, schema, exclude: Iterable[str] = ()) -> list:
+    """Model columns for every schema field that maps 1:1 onto a mapped column."""
+    return [
+        getattr(model, name) for name in schema.model_fields
+        if name not in exclude and name in model.__table__.c
+    ]
+
+
+def rows_to_dicts(rows, fields: Sequence[str]) -> list[dict]:
+    """Column rows -> plain dicts, without validation."""
+    return [dict(zip(fields, row)) for row in rows]
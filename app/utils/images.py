@@ -0,0 +1,116 @@
+"""
+Member photo processing.
+
+An uploaded photo (often a multi-MB phone picture) is decoded once and
+written as fixed-size variants:
+
+    thumb  128px  - avatars in the member list
+    card   480px  - member detail card
+    full  1600px  - full view
+
+Variants are named after the SHA-256 of the uploaded bytes
+(<hash>_<variant>.webp, stored under a fan-out key by app/storage), so
+every new photo gets new URLs, browsers/CDNs never serve a stale one, and
+the same photo is only stored once.
+
+Decoding and resizing is CPU bound, so it runs in a small process pool
+instead of the API process: other requests don't wait on the GIL while a
+photo is being resized.
+"""
+
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from PIL import Image, ImageOps
+
+VARIANT_SIZES = {"thumb": 128, "card": 480, "full": 1600}
+FORMAT_EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+# Pillow warns above this many pixels and raises DecompressionBombError above
+# twice as many, instead of decoding a tiny file into gigabytes of memory
+Image.MAX_IMAGE_PIXELS = 40_000_000
+
+# .../<hash>_<variant>.<ext>; also matches the older member_{id}_<16 hex>_<variant> names
+VARIANT_PATTERN = re.compile(r"^(?P<prefix>.*[/_][0-9a-f]{16,64})_(?:thumb|card|full)\.(?P<ext>webp|jpg)$")
+
+
+def process_image(source: str, stem: str, out_dir: str, fmt: str = "webp", quality: int = 80) -> Dict[str, str]:
+    """
+    Write every size variant of an image. Runs inside the worker pool.
+
+    Args:
+        source: Path of the uploaded file (read here, so the upload is
+            never pickled across the process boundary)
+        stem: File name prefix, normally the SHA-256 of the upload
+        out_dir: Directory to write the variants to
+        fmt: "webp" or "jpeg"
+        quality: Encoder quality (0-100)
+
+    Returns:
+        {variant name: file name}
+
+    Raises:
+        PIL.UnidentifiedImageError: source is not a readable image
+        PIL.Image.DecompressionBombError: image has too many pixels
+    """
+    ext = FORMAT_EXTENSIONS[fmt]
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        keep_alpha = fmt == "webp" and img.mode in ("RGBA", "LA", "P")
+        img = img.convert("RGBA" if keep_alpha else "RGB")
+
+        filenames = {}
+        for name, size in VARIANT_SIZES.items():
+            filename = f"{stem}_{name}.{ext}"
+            target = out / filename
+            if not target.exists():  # same content already processed
+                variant = img.copy()
+                variant.thumbnail((size, size), Image.LANCZOS)
+                tmp = out / f".{filename}.{os.getpid()}.tmp"
+                variant.save(tmp, format=fmt.upper(), quality=quality, optimize=True)
+                os.replace(tmp, target)
+            filenames[name] = filename
+    return filenames
+
+
+def variant_urls(image_url: Optional[str]) -> Optional[Dict[str, str]]:
+    """
+    URLs of every variant, derived from the stored (full) image_url.
+    None for a missing image or one uploaded before variants existed.
+    """
+    if not image_url:
+        return None
+    match = VARIANT_PATTERN.match(image_url)
+    if not match:
+        return None
+    return {name: f"{match['prefix']}_{name}.{match['ext']}" for name in VARIANT_SIZES}
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+# uploads reach get_image_pool from threadpool threads; two first uploads must not both start a pool
+_pool_lock = threading.Lock()
+
+
+def get_image_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Lazily started process pool (spawn: safe next to the server's threads)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_image_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,278 @@
+"""
+In-process typeahead index for /members/search.
+
+Names are normalized (case folded, accents stripped) and split into
+tokens kept in a sorted list, so a prefix lookup is a bisect plus a short
+scan. Phone numbers are reduced to digits and indexed both forwards and
+reversed, so "98765" finds a number starting with those digits and "4321"
+one ending with them, whatever spaces, dashes or "+" were typed.
+
+The index loads all members (id, name, phone) on first use. After that,
+the endpoints that write members update it straight away, and before
+answering a search it applies changes made through other workers, using
+the same updated_at / tombstone delta as /members/changes (at most every
+refresh_seconds).
+"""
+
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from datetime import timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import MEMBER_SEARCH_REFRESH_SECONDS
+from app.models.members import Member, MemberTombstone
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_NON_DIGIT = re.compile(r"\D+")
+
+# re-read the second of the watermark, timestamps may be second precision
+_OVERLAP = timedelta(seconds=1)
+# a delta bigger than this rebuilds the index instead of patching it
+REBUILD_THRESHOLD = 5000
+# national numbers are 10 digits; "+91 98765 43210" is also found by "98765"
+NATIONAL_NUMBER_DIGITS = 10
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """'  José  O'Brien ' -> 'jose o brien'"""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def phone_digits(value: Optional[str]) -> str:
+    return _NON_DIGIT.sub("", value or "")
+
+
+def _name_keys(name: str) -> Set[str]:
+    return set(name.split())
+
+
+def _phone_keys(digits: str) -> Set[str]:
+    """The number as typed plus without country code / trunk 0."""
+    if not digits:
+        return set()
+    return {digits, digits[-NATIONAL_NUMBER_DIGITS:], digits.lstrip("0") or digits}
+
+
+class _SortedPrefixIndex:
+    """Sorted (key, ..., id) tuples: everything whose key starts with a prefix."""
+
+    def __init__(self):
+        self._entries: List[tuple] = []
+
+    def add(self, entry: tuple):
+        bisect.insort(self._entries, entry)
+
+    def remove(self, entry: tuple):
+        i = bisect.bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+
+    def _bounds(self, prefix: str) -> Tuple[int, int]:
+        start = bisect.bisect_left(self._entries, (prefix,))
+        return start, bisect.bisect_left(self._entries, (prefix + "\uffff",), lo=start)
+
+    def iter_prefix(self, prefix: str) -> Iterator[tuple]:
+        """Entries whose key starts with prefix, in key order (lazy)."""
+        return map(self._entries.__getitem__, range(*self._bounds(prefix)))
+
+    def iter_prefix_by_value(self, prefix: str, max_keys: int = 64) -> Optional[Iterator[tuple]]:
+        """
+        Entries whose key starts with prefix, ordered by what follows the key
+        (lazy merge of the per-key runs). None if more than max_keys distinct
+        keys start with prefix.
+        """
+        start, end = self._bounds(prefix)
+        runs = []
+        while start < end:
+            if len(runs) == max_keys:
+                return None
+            key = self._entries[start][0]
+            run_end = bisect.bisect_left(self._entries, (key + "\x00",), lo=start, hi=end)
+            runs.append(map(self._entries.__getitem__, range(start, run_end)))
+            start = run_end
+        return heapq.merge(*runs, key=lambda entry: entry[1:])
+
+    def ids(self, prefix: str) -> Set[int]:
+        start, end = self._bounds(prefix)
+        return {entry[-1] for entry in self._entries[start:end]}
+
+    def load(self, entries: List[tuple]):
+        self._entries = sorted(entries)
+
+
+class MemberSearchIndex:
+    """
+    Three sorted lists:
+        (name, id)          full normalized names - "starts with" matches, in name order
+        (token, name, id)   every word of every name - matches on later words, in name order
+        (digits, id)        phone keys, plus the same reversed for "ends with"
+    """
+
+    def __init__(self, refresh_seconds: float = 2.0):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._docs: Dict[int, Tuple[str, str]] = {}  # id -> (normalized name, phone digits)
+        self._names = _SortedPrefixIndex()
+        self._tokens = _SortedPrefixIndex()
+        self._phones = _SortedPrefixIndex()
+        self._phones_reversed = _SortedPrefixIndex()
+        self._watermark = None
+        self._last_refresh = 0.0
+
+    # ---------- maintenance ----------
+    def upsert(self, member_id: int, name: Optional[str], phone: Optional[str]):
+        doc = (normalize_text(name), phone_digits(phone))
+        with self._lock:
+            if self._watermark is None:
+                return  # not loaded yet; the first search reads everything
+            if self._docs.get(member_id) == doc:
+                return
+            self._remove_locked(member_id)
+            self._docs[member_id] = doc
+            self._names.add((doc[0], member_id))
+            for token in _name_keys(doc[0]):
+                self._tokens.add((token, doc[0], member_id))
+            for key in _phone_keys(doc[1]):
+                self._phones.add((key, member_id))
+                self._phones_reversed.add((key[::-1], member_id))
+
+    def remove(self, member_id: int):
+        with self._lock:
+            self._remove_locked(member_id)
+
+    def _remove_locked(self, member_id: int):
+        doc = self._docs.pop(member_id, None)
+        if doc is None:
+            return
+        self._names.remove((doc[0], member_id))
+        for token in _name_keys(doc[0]):
+            self._tokens.remove((token, doc[0], member_id))
+        for key in _phone_keys(doc[1]):
+            self._phones.remove((key, member_id))
+            self._phones_reversed.remove((key[::-1], member_id))
+
+    def _rebuild(self, rows, watermark):
+        """Replace the whole index; sorting once beats inserting row by row."""
+        docs = {member_id: (normalize_text(name), phone_digits(phone)) for member_id, name, phone in rows}
+        tokens, phones = [], []
+        for member_id, (name, digits) in docs.items():
+            tokens.extend((token, name, member_id) for token in _name_keys(name))
+            phones.extend((key, member_id) for key in _phone_keys(digits))
+        with self._lock:
+            self._docs = docs
+            self._names.load([(name, member_id) for member_id, (name, _) in docs.items()])
+            self._tokens.load(tokens)
+            self._phones.load(phones)
+            self._phones_reversed.load([(key[::-1], member_id) for key, member_id in phones])
+            self._watermark = watermark
+
+    def refresh(self, db: Session, force: bool = False):
+        """Full load on first use, then apply changes made since the last refresh."""
+        now = time.monotonic()
+        if not force and self._watermark is not None and now - self._last_refresh < self.refresh_seconds:
+            return
+        watermark = db.scalar(select(func.now()))
+        columns = (Member.id, Member.name, Member.phone)
+        if self._watermark is None:
+            self._rebuild(db.query(*columns).all(), watermark)
+        else:
+            since = self._watermark - _OVERLAP
+            deleted = [member_id for (member_id,) in
+                       db.query(MemberTombstone.member_id).filter(MemberTombstone.deleted_at >= since)]
+            rows = db.query(*columns).filter(Member.updated_at >= since).all()
+            if len(rows) > REBUILD_THRESHOLD:
+                # bulk import: cheaper to start over
+                self._rebuild(db.query(*columns).all(), watermark)
+            else:
+                # deletions first: rows returned here exist now (ids may be reused)
+                for member_id in deleted:
+                    self.remove(member_id)
+                for member_id, name, phone in rows:
+                    self.upsert(member_id, name, phone)
+                self._watermark = watermark
+        self._last_refresh = now
+
+    # ---------- search ----------
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """
+        Member ids matching query, best first.
+
+        Every word of the query must prefix-match a word of the name
+        ("jo smi" finds "John Smith"). Names starting with the first word
+        come first, then other matches, each in name order. A query of
+        digits (spaces, dashes and "+" allowed) matches the start or the end
+        of the phone number instead.
+        """
+        words = normalize_text(query).split()
+        digits = phone_digits(query)
+        if not words:
+            return []
+
+        with self._lock:
+            if len(digits) >= 3 and digits == "".join(words):  # a phone number, not a name
+                return self._search_phone(digits, limit)
+
+            # 1) names starting with the first word: already in name order, so
+            #    a short scan usually fills the page without touching the rest
+            hits = []
+            for name, member_id in self._names.iter_prefix(words[0]):
+                if _matches_words(name, words[1:]):
+                    hits.append(member_id)
+                    if len(hits) == limit:
+                        return hits
+
+            # 2) the first word matches a later word of the name; everything
+            #    starting with it is in hits already
+            seen = set(hits)
+            merged = self._tokens.iter_prefix_by_value(words[0])
+            if merged is not None:
+                for _, name, member_id in merged:
+                    if member_id not in seen and _matches_words(name, words[1:]):
+                        seen.add(member_id)
+                        hits.append(member_id)
+                        if len(hits) == limit:
+                            break
+                return hits
+
+            # very short prefix shared by many different words: rank them all
+            candidates = min((self._tokens.ids(word) for word in words), key=len) - seen
+            docs = self._docs
+            rest = heapq.nsmallest(
+                limit - len(hits),
+                ((docs[member_id][0], member_id) for member_id in candidates
+                 if _matches_words(docs[member_id][0], words)),
+            )
+            return hits + [member_id for _, member_id in rest]
+
+    def _search_phone(self, digits: str, limit: int) -> List[int]:
+        hits = {}
+        for _, member_id in self._phones.iter_prefix(digits):
+            hits.setdefault(member_id, None)
+            if len(hits) == limit:
+                return list(hits)
+        for _, member_id in self._phones_reversed.iter_prefix(digits[::-1]):
+            hits.setdefault(member_id, None)
+            if len(hits) == limit:
+                break
+        return list(hits)
+
+
+def _matches_words(name: str, words: List[str]) -> bool:
+    """Every word is a prefix of some word of name."""
+    tokens = name.split()
+    return all(any(token.startswith(word) for token in tokens) for word in words)
+
+
+# one per worker process
+member_search_index = MemberSearchIndex(MEMBER_SEARCH_REFRESH_SECONDS)
@@ -0,0 +1,123 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Instead of OFFSET, each page remembers the (sort value, id) of its last row
+and the next page starts strictly after it. The database can then seek
+straight into a composite index, so page 1000 costs the same as page 1.
+
+The cursor handed to clients is an opaque url-safe base64 string.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Encode the last row's (sort value, id) into an opaque cursor string."""
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, python_type: type) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: The opaque cursor string from a previous page
+        python_type: Type of the sort column (datetime, date, int, ...)
+
+    Raises:
+        400: Cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if sort_value is not None and python_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif sort_value is not None and python_type is date:
+            sort_value = date.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(sort_col, id_col, last_value, last_id, descending: bool, nullable: bool):
+    """WHERE clause selecting rows that come after (last_value, last_id)."""
+    if last_value is None:
+        # NULLs sort lowest (MySQL/SQLite): last in a descending scan, first in an ascending one
+        if descending:
+            return and_(sort_col.is_(None), id_col < last_id)
+        return or_(and_(sort_col.is_(None), id_col > last_id), sort_col.isnot(None))
+
+    # "sort <= v AND (sort < v OR id < last_id)" keeps the leading range
+    # predicate sargable so the database can seek into the index.
+    if descending:
+        clause = and_(sort_col <= last_value, or_(sort_col < last_value, id_col < last_id))
+        # NULL rows are still ahead of us in a descending scan
+        return or_(clause, sort_col.is_(None)) if nullable else clause
+    return and_(sort_col >= last_value, or_(sort_col > last_value, id_col > last_id))
+
+
+def keyset_page(query, sort_col, id_col, cursor: Optional[str], limit: int,
+                descending: bool = True, nullable: bool = False):
+    """
+    Apply keyset pagination ordered by (sort_col, id_col) to a query.
+
+    Args:
+        query: SQLAlchemy query already carrying the endpoint's filters
+        sort_col: Column to order by
+        id_col: Primary key column used as tie-breaker
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Maximum number of rows to return
+        descending: Newest-first when True, oldest-first otherwise
+        nullable: sort_col may be NULL (NULLs sort lowest, as in MySQL/SQLite)
+
+    Returns:
+        (rows, next_cursor) where next_cursor is None on the last page.
+        Rows may be ORM objects or column rows, as long as they expose
+        sort_col and id_col by attribute name.
+    """
+    rows = _keyset(query, sort_col, id_col, cursor, limit, descending, nullable).all()
+    return finish_page(rows, sort_col, id_col, limit)
+
+
+def keyset_select(stmt, sort_col, id_col, cursor: Optional[str], limit: int,
+                  descending: bool = True, nullable: bool = False):
+    """
+    keyset_page for a select(): the same filtering and ordering, for
+    endpoints that execute on either Session or AsyncSession. Pass the rows
+    to finish_page().
+    """
+    return _keyset(stmt, sort_col, id_col, cursor, limit, descending, nullable)
+
+
+def finish_page(rows, sort_col, id_col, limit: int):
+    """(rows, next_cursor) from the limit + 1 rows a keyset query returned."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
+
+
+def _keyset(query, sort_col, id_col, cursor, limit, descending, nullable):
+    # Query and Select share filter / order_by / limit
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort_col.type.python_type)
+        query = query.filter(_after_cursor(sort_col, id_col, last_value, last_id, descending, nullable))
+
+    if descending:
+        query = query.order_by(sort_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(sort_col.asc(), id_col.asc())
+
+    # fetch one extra row to know whether another page exists
+    return query.limit(limit + 1)
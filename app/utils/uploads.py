@@ -0,0 +1,87 @@
+"""
+Receiving uploaded files safely.
+
+receive_upload copies an UploadFile to disk in fixed-size chunks:
+- the first chunk is checked against known magic bytes, so a renamed PDF
+  or executable is rejected before anything else is read,
+- a hard byte cap stops oversized uploads as soon as they cross it,
+- data goes to a temp file in the destination directory and is hashed on
+  the way; the caller renames or processes it, a failure removes it.
+
+Request bodies are also capped before they reach FastAPI's multipart
+parser by app/core/body_limit.py.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+CHUNK_SIZE = 64 * 1024
+
+# (offset, signature) pairs per image type
+IMAGE_SIGNATURES = {
+    "jpeg": [(0, b"\xff\xd8\xff")],
+    "png": [(0, b"\x89PNG\r\n\x1a\n")],
+    "webp": [(0, b"RIFF"), (8, b"WEBP")],
+}
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Image type from the first bytes of a file, or None if not a supported image."""
+    for image_type, signatures in IMAGE_SIGNATURES.items():
+        if all(head[offset:offset + len(sig)] == sig for offset, sig in signatures):
+            return image_type
+    return None
+
+
+def receive_upload(file: UploadFile, dest_dir: Path, max_bytes: int) -> Tuple[Path, str, str]:
+    """
+    Stream an uploaded image into a temp file inside dest_dir.
+
+    Args:
+        file: The uploaded file
+        dest_dir: Directory for the temp file (same filesystem as the final
+            location, so os.replace is atomic)
+        max_bytes: Hard size limit
+
+    Returns:
+        (temp path, image type, hex sha256). The caller owns the temp file.
+
+    Raises:
+        400: Empty file or not a JPEG/PNG/WebP image
+        413: File larger than max_bytes
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=dest_dir, prefix=".upload-", suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    sha = hashlib.sha256()
+    size = 0
+    image_type = None
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := file.file.read(CHUNK_SIZE):
+                if image_type is None:
+                    image_type = sniff_image_type(chunk)
+                    if image_type is None:
+                        raise HTTPException(status_code=400, detail="File is not a JPEG, PNG or WebP image")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Image too large. Maximum size is {max_bytes / (1024 * 1024):.1f} MB",
+                    )
+                sha.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty file")
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        file.file.close()
+    return tmp_path, image_type, sha.hexdigest()
+
@@ -0,0 +1,53 @@
+"""
+Workout statistics helpers.
+
+bucket_start_expr() builds the SQL expression that truncates a date to the
+start of its week (Monday) or month, so GROUP BY can be done by the
+database for MySQL, SQLite and PostgreSQL.
+
+compute_streaks() turns the member's distinct workout dates into the
+current and longest run of consecutive training days.
+"""
+
+from datetime import date, timedelta
+from typing import Iterable, Tuple
+
+from sqlalchemy import func
+
+
+def bucket_start_expr(dialect: str, granularity: str, column):
+    """SQL expression for the first day of the week/month containing column."""
+    if dialect == "mysql":
+        if granularity == "week":
+            # SUBDATE(d, n) subtracts n days; WEEKDAY() is 0 for Monday
+            return func.subdate(column, func.weekday(column))
+        return func.date_format(column, "%Y-%m-01")
+    if dialect == "sqlite":
+        if granularity == "week":
+            # 'weekday 0' moves forward to Sunday (or stays), -6 days lands on Monday
+            return func.date(column, "weekday 0", "-6 days")
+        return func.strftime("%Y-%m-01", column)
+    # PostgreSQL and others with date_trunc
+    return func.date(func.date_trunc(granularity, column))
+
+
+def compute_streaks(dates: Iterable[date], today: date) -> Tuple[int, int]:
+    """
+    Current and longest streak of consecutive workout days.
+
+    Args:
+        dates: Distinct workout dates in ascending order
+        today: Reference day; the current streak may end today or yesterday
+
+    Returns:
+        (current_streak_days, longest_streak_days)
+    """
+    longest = run = 0
+    previous = None
+    for d in dates:
+        run = run + 1 if previous is not None and d - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = d
+
+    current = run if previous is not None and (today - previous).days <= 1 else 0
+    return current, longest
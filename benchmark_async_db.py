@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Benchmark the async database path against the sync one under concurrency.
+
+Seeds a throwaway SQLite database and mounts sync and async twins of the
+hot reads on a small app: the principal lookup that runs on every
+authenticated request, followed by member detail, the plans list or
+today's attendance. Sync twins use SessionLocal-style sessions inside
+the threadpool (as the endpoints did before), async twins use
+AsyncSession on aiosqlite. Requests are fired in-process at each
+concurrency level, and the script prints throughput and p50/p99 latency.
+
+SQLite answers in microseconds, so on its own it hides what async buys.
+--latency-ms adds a server-side wait to every query (an extra
+`SELECT bench_wait(ms)` run on the database connection's thread), which
+stands in for the round trip to a MySQL server on another machine.
+Both paths get the same connection pool size. Requests that wait longer
+than --pool-timeout for a connection fail and are counted as errors.
+
+The app's endpoints stay sync because the async twins measured slower on
+SQLite. get_async_db is kept for async endpoints; run this against a MySQL
+server before moving these reads onto it.
+
+Usage:
+    python benchmark_async_db.py [--rows 5000] [--latency-ms 2]
+                                 [--concurrency 10 100 400] [--pool-size 20]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = ["member", "plans", "attendance"]
+
+
+def seed(url: str, rows: int):
+    """Fill the database with one admin, `rows` members, plans and attendance rows."""
+    from datetime import date, datetime, timedelta, timezone
+    from sqlalchemy import create_engine, insert
+    from app.db.base import Base
+    from app.models import query, trainers_profile, workout  # noqa: F401 (User's relationships)
+    from app.models.members import Member
+    from app.models.membership_plans import MembershipPlan
+    from app.models.T_attendance import TrainerAttendance
+    from app.models.user import User
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"name": "bench admin", "email": "admin@bench.local", "password_hash": "x",
+             "role": "admin", "status": "approved", "created_at": now}
+        ] + [
+            {"name": f"trainer {i}", "email": f"trainer{i}@bench.local", "password_hash": "x",
+             "role": "trainer", "status": "approved", "created_at": now}
+            for i in range(20)
+        ])
+        conn.execute(insert(Member), [
+            {"name": f"member {i}", "phone": f"{9000000000 + i}", "age": 20 + i % 40, "gender": "F",
+             "address": "Street " * 5, "membership_type": "monthly",
+             "membership_start": date.today() - timedelta(days=i % 300),
+             "membership_end": date.today() + timedelta(days=30), "created_at": now}
+            for i in range(rows)
+        ])
+        conn.execute(insert(MembershipPlan), [
+            {"name": f"plan {i}", "description": "Access to the floor " * 3, "price": 1000 + i * 100,
+             "discount": 10, "final_price": (1000 + i * 100) * 0.9, "duration_days": 30 * (i + 1),
+             "is_active": True, "created_at": now, "updated_at": now}
+            for i in range(8)
+        ])
+        # twenty trainers on the floor today, the rest is history
+        conn.execute(insert(TrainerAttendance), [
+            {"trainer_id": 2 + i % 20,
+             "check_in": now - timedelta(minutes=i) if i < 20 else now - timedelta(days=1 + i // 20),
+             "check_out": None if i < 20 else now - timedelta(days=1 + i // 20) + timedelta(hours=6),
+             "auto_closed": False, "created_at": now}
+            for i in range(rows)
+        ])
+    engine.dispose()
+
+
+def build_app(url: str, pool_size: int, pool_timeout: float, latency_ms: float):
+    """Sync and async twins of the hot reads, on engines of the same pool size."""
+    from datetime import datetime, timezone
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy import create_engine, event, select, text
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.orm import Session, sessionmaker
+    from app.db.database import async_database_url
+    from app.models.members import Member
+    from app.models.membership_plans import MembershipPlan
+    from app.models.T_attendance import TrainerAttendance
+    from app.models.user import User
+
+    pool = {"pool_size": pool_size, "max_overflow": 0, "pool_timeout": pool_timeout}
+    sync_engine = create_engine(url, **pool)
+    async_engine = create_async_engine(async_database_url(url), **pool)
+
+    def add_wait_function(dbapi_connection, connection_record):
+        # runs on the connection's own thread: a sync worker thread, or aiosqlite's
+        dbapi_connection.create_function("bench_wait", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+    event.listen(sync_engine, "connect", add_wait_function)
+    event.listen(async_engine.sync_engine, "connect", add_wait_function)
+
+    SyncSession = sessionmaker(bind=sync_engine, autoflush=False)
+    AsyncSessionMaker = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    wait = text("SELECT bench_wait(:ms)").bindparams(ms=latency_ms)
+
+    def today():
+        now = datetime.now(timezone.utc)
+        return datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
+
+    # ---------- sync twins: deps and endpoints run in the threadpool ----------
+    def sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def sync_principal(db: Session = Depends(sync_db)):
+        if latency_ms:
+            db.execute(wait)
+        user = db.get(User, 1)
+        if user is None:
+            raise HTTPException(status_code=401)
+        # like get_current_user: hand the connection back before the endpoint runs
+        db.expunge(user)
+        db.rollback()
+        return user
+
+    def sync_get(db: Session, stmt):
+        if latency_ms:
+            db.execute(wait)
+        return db.scalars(stmt).all()
+
+    app = FastAPI()
+
+    @app.get("/sync/member/{member_id}")
+    def sync_member(member_id: int, user=Depends(sync_principal), db: Session = Depends(sync_db)):
+        if latency_ms:
+            db.execute(wait)
+        return {"name": db.get(Member, member_id).name}
+
+    @app.get("/sync/plans")
+    def sync_plans(user=Depends(sync_principal), db: Session = Depends(sync_db)):
+        return [plan.name for plan in sync_get(db, select(MembershipPlan))]
+
+    @app.get("/sync/attendance")
+    def sync_attendance(user=Depends(sync_principal), db: Session = Depends(sync_db)):
+        stmt = select(TrainerAttendance).where(TrainerAttendance.check_in >= today()) \
+            .order_by(TrainerAttendance.check_in.desc())
+        return [row.trainer_id for row in sync_get(db, stmt)]
+
+    # ---------- async twins ----------
+    async def async_db():
+        async with AsyncSessionMaker() as db:
+            yield db
+
+    async def async_principal(db: AsyncSession = Depends(async_db)):
+        if latency_ms:
+            await db.execute(wait)
+        user = await db.get(User, 1)
+        if user is None:
+            raise HTTPException(status_code=401)
+        db.expunge(user)
+        await db.rollback()
+        return user
+
+    async def async_get(db: AsyncSession, stmt):
+        if latency_ms:
+            await db.execute(wait)
+        return (await db.scalars(stmt)).all()
+
+    @app.get("/async/member/{member_id}")
+    async def async_member(member_id: int, user=Depends(async_principal), db: AsyncSession = Depends(async_db)):
+        if latency_ms:
+            await db.execute(wait)
+        return {"name": (await db.get(Member, member_id)).name}
+
+    @app.get("/async/plans")
+    async def async_plans(user=Depends(async_principal), db: AsyncSession = Depends(async_db)):
+        return [plan.name for plan in await async_get(db, select(MembershipPlan))]
+
+    @app.get("/async/attendance")
+    async def async_attendance(user=Depends(async_principal), db: AsyncSession = Depends(async_db)):
+        stmt = select(TrainerAttendance).where(TrainerAttendance.check_in >= today()) \
+            .order_by(TrainerAttendance.check_in.desc())
+        return [row.trainer_id for row in await async_get(db, stmt)]
+
+    async def dispose():
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+    return app, dispose
+
+
+async def hammer(client, urls, concurrency: int, requests: int):
+    """Fire `requests` GETs with `concurrency` in flight; (throughput, p50 ms, p99 ms, errors)."""
+    gate = asyncio.Semaphore(concurrency)
+    timings = []
+    errors = 0
+
+    async def one(i):
+        nonlocal errors
+        async with gate:
+            start = time.perf_counter()
+            response = await client.get(urls[i % len(urls)])
+            timings.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    timings.sort()
+    return (requests / elapsed, statistics.median(timings) * 1000,
+            timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000, errors)
+
+
+async def run(args, url):
+    import httpx
+
+    app, dispose = build_app(url, args.pool_size, args.pool_timeout, args.latency_ms)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for name in ENDPOINTS:
+            for mode in ("sync", "async"):
+                if name == "member":
+                    urls = [f"/{mode}/member/{1 + i * 7919 % args.rows}" for i in range(64)]
+                else:
+                    urls = [f"/{mode}/{name}"]
+                await hammer(client, urls, 10, 50)  # warm up pools and caches
+                for concurrency in args.concurrency:
+                    requests = max(args.requests, concurrency * 3)
+                    results[name, mode, concurrency] = await hammer(client, urls, concurrency, requests)
+    await dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=600, help="requests per endpoint and level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 400])
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--pool-timeout", type=float, default=5.0)
+    parser.add_argument("--latency-ms", type=float, default=2.0,
+                        help="simulated database round trip per query (0 for raw SQLite)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{tmp}/bench.db"
+        seed(url, args.rows)
+        results = asyncio.run(run(args, url))
+
+    print(f"\nHot reads, {args.rows} rows, pool {args.pool_size}, "
+          f"{args.latency_ms:g} ms per query (threadpool: 40 threads)\n")
+    print(f"{'endpoint':<12}{'conc':>6}{'sync req/s':>12}{'async req/s':>13}{'speedup':>9}"
+          f"{'sync p50/p99 ms':>18}{'async p50/p99 ms':>19}")
+    for name in ENDPOINTS:
+        for concurrency in args.concurrency:
+            s_rps, s_p50, s_p99, s_err = results[name, "sync", concurrency]
+            a_rps, a_p50, a_p99, a_err = results[name, "async", concurrency]
+            errors = f"  errors {s_err}/{a_err}" if s_err or a_err else ""
+            print(f"{name:<12}{concurrency:>6}{s_rps:>12.0f}{a_rps:>13.0f}{a_rps / s_rps:>8.1f}x"
+                  f"{f'{s_p50:.0f}/{s_p99:.0f}':>18}{f'{a_p50:.0f}/{a_p99:.0f}':>19}{errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark the list endpoints: default path vs FAST_LIST_RESPONSES.
+
+Seeds a throwaway SQLite database, then runs every endpoint in a fresh
+process for each mode (the flag is read at import time) and prints the
+median latency per endpoint. It also checks that both modes return the
+same JSON.
+
+Usage:
+    python benchmark_list_endpoints.py [--rows 5000] [--repeat 20]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = [
+    ("members", "/members/"),
+    ("trainers", "/trainers/"),
+    ("queries", "/queries/"),
+    ("attendance", "/trainer-attendance/?limit=500"),
+    ("workouts", "/workouts/?limit=200"),
+]
+
+
+def seed(rows: int):
+    """Fill the database with `rows` members/queries/attendance/workouts."""
+    from datetime import date, datetime, timedelta, timezone
+    from sqlalchemy import insert
+    from app.db.database import Base, engine
+    from app.models.members import Member
+    from app.models.query import Query
+    from app.models.trainers_profile import TrainerProfile
+    from app.models.T_attendance import TrainerAttendance
+    from app.models.user import User
+    from app.models.workout import Workout
+
+    engine.echo = False
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"name": "bench admin", "email": "admin@bench.local", "password_hash": "x",
+             "role": "admin", "status": "approved", "created_at": now}
+        ] + [
+            {"name": f"trainer {i}", "email": f"trainer{i}@bench.local", "password_hash": "x",
+             "role": "trainer", "status": "approved", "created_at": now}
+            for i in range(max(rows // 10, 1))
+        ])
+        conn.execute(insert(TrainerProfile), [
+            {"user_id": i + 2, "name": f"trainer {i}", "specialization": "strength",
+             "bio": "Bio " * 20, "experience_years": i % 15, "phone": "9000000000",
+             "certifications": "ACE", "created_at": now, "updated_at": now}
+            for i in range(max(rows // 10, 1))
+        ])
+        conn.execute(insert(Member), [
+            {"name": f"member {i}", "phone": f"{9000000000 + i}", "age": 20 + i % 40, "gender": "F",
+             "address": "Street " * 5, "membership_type": "monthly",
+             "membership_start": date.today() - timedelta(days=i % 300),
+             "membership_end": date.today() + timedelta(days=30), "created_at": now}
+            for i in range(rows)
+        ])
+        conn.execute(insert(Query), [
+            {"name": f"lead {i}", "mobile": f"{8000000000 + i}", "email": f"lead{i}@bench.local",
+             "message": "Interested in a trial " * 5, "status": "new", "created_at": now}
+            for i in range(rows)
+        ])
+        conn.execute(insert(TrainerAttendance), [
+            {"trainer_id": 2 + i % max(rows // 10, 1), "check_in": now - timedelta(hours=i),
+             "check_out": now - timedelta(hours=i) + timedelta(hours=6), "auto_closed": False,
+             "created_at": now}
+            for i in range(rows)
+        ])
+        conn.execute(insert(Workout), [
+            {"user_id": 1, "name": f"workout {i}", "description": "Sets and reps " * 10,
+             "date": date.today() - timedelta(days=i), "duration": 45, "calories": 300,
+             "notes": "Felt good " * 10, "created_at": now, "updated_at": now}
+            for i in range(rows)
+        ])
+
+
+def run_child(repeat: int):
+    """Time every endpoint in this process and print the result as JSON."""
+    from fastapi.testclient import TestClient
+    from app.auth.jwt_handler import create_access_token
+    from app.db.database import engine
+    from app.main import app
+
+    engine.echo = False
+    headers = {"Authorization": "Bearer " + create_access_token(1)}
+    results = {}
+    with TestClient(app) as client:
+        for name, url in ENDPOINTS:
+            client.get(url, headers=headers)  # warm up
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                response = client.get(url, headers=headers)
+                timings.append(time.perf_counter() - start)
+            body = response.json()
+            digest = hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+            results[name] = {"median_ms": statistics.median(timings) * 1000,
+                             "bytes": len(response.content), "digest": digest}
+    print("RESULT " + json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--seed-only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed_only:
+        seed(args.rows)
+        return
+    if args.child:
+        run_child(args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/bench.db", ATTENDANCE_AUTOCLOSE_ENABLED="false")
+        subprocess.run([sys.executable, __file__, "--seed-only", "--rows", str(args.rows)],
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+
+        results = {}
+        for mode, flag in (("default", "false"), ("fast", "true")):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", "--repeat", str(args.repeat)],
+                env=dict(env, FAST_LIST_RESPONSES=flag), check=True, capture_output=True, text=True,
+            ).stdout
+            line = next(l for l in out.splitlines() if l.startswith("RESULT "))
+            results[mode] = json.loads(line[len("RESULT "):])
+
+    print(f"\nList endpoints, {args.rows} rows, median of {args.repeat} requests\n")
+    print(f"{'endpoint':<12}{'default ms':>12}{'fast ms':>10}{'speedup':>9}{'KB':>8}  same JSON")
+    for name, _ in ENDPOINTS:
+        default, fast = results["default"][name], results["fast"][name]
+        print(f"{name:<12}{default['median_ms']:>12.1f}{fast['median_ms']:>10.1f}"
+              f"{default['median_ms'] / fast['median_ms']:>8.1f}x{default['bytes'] / 1024:>8.0f}"
+              f"  {'yes' if default['digest'] == fast['digest'] else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Benchmark the SQLite profile against SQLite's own defaults on one box.
+
+Seeds a throwaway database per profile and measures it twice:
+
+- database: one process committing single-row member updates while
+  --readers processes look members up, all on the same file. This is
+  where the journal mode shows: with the rollback journal, readers wait
+  out every commit.
+- api: --workers API processes on the same file, like
+  `uvicorn --workers N` would run them. Each drives the app in-process
+  with --concurrency clients, using a front-desk mix: member lookups,
+  attendance and plan lists, member edits and sign-ups.
+
+The script prints throughput and p50/p99 latency per profile. Each part
+runs for --seconds.
+
+Profiles:
+    default  SQLite's defaults: rollback journal, synchronous=FULL, no mmap, 2 MB cache
+    tuned    app/db/sqlite.py: WAL, synchronous=NORMAL, 256 MB mmap, 64 MB cache
+
+Both wait up to 5 s for a lock. foreign_keys and temp_store are set in both.
+
+Usage:
+    python benchmark_sqlite_profile.py [--rows 20000] [--readers 3] [--workers 1 4]
+                                       [--concurrency 20] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PROFILES = {
+    "default": {"SQLITE_JOURNAL_MODE": "delete", "SQLITE_SYNCHRONOUS": "full",
+                "SQLITE_MMAP_SIZE": "0", "SQLITE_CACHE_SIZE_KB": "2000"},
+    "tuned": {},
+}
+
+# (weight, method, path, writes)
+MIX = [
+    (40, "GET", "/members/{id}", False),
+    (20, "GET", "/trainer-attendance/?limit=50", False),
+    (15, "GET", "/plans/", False),
+    (15, "PUT", "/members/{id}", True),
+    (10, "POST", "/members/", True),
+]
+
+
+def seed(rows: int):
+    """Fill the database with an admin, trainers, `rows` members and attendance rows, plans."""
+    from datetime import date, datetime, timedelta, timezone
+    from sqlalchemy import insert
+    from app.main import app  # noqa: F401 registers every model
+    from app.db.database import Base, engine
+    from app.models.members import Member
+    from app.models.membership_plans import MembershipPlan
+    from app.models.T_attendance import TrainerAttendance
+    from app.models.user import User
+
+    engine.echo = False
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"name": "bench admin", "email": "admin@bench.local", "password_hash": "x",
+             "role": "admin", "status": "approved", "created_at": now}
+        ] + [
+            {"name": f"trainer {i}", "email": f"trainer{i}@bench.local", "password_hash": "x",
+             "role": "trainer", "status": "approved", "created_at": now}
+            for i in range(20)
+        ])
+        conn.execute(insert(Member), [
+            {"name": f"member {i}", "phone": f"{9000000000 + i}", "age": 20 + i % 40, "gender": "F",
+             "address": "Street " * 5, "membership_type": "monthly",
+             "membership_start": date.today() - timedelta(days=i % 300),
+             "membership_end": date.today() + timedelta(days=30), "created_at": now, "updated_at": now}
+            for i in range(rows)
+        ])
+        conn.execute(insert(MembershipPlan), [
+            {"name": f"plan {i}", "description": "Access to the floor " * 3, "price": 1000 + i * 100,
+             "discount": 10, "final_price": (1000 + i * 100) * 0.9, "duration_days": 30 * (i + 1),
+             "is_active": True, "created_at": now, "updated_at": now}
+            for i in range(8)
+        ])
+        conn.execute(insert(TrainerAttendance), [
+            {"trainer_id": 2 + i % 20, "check_in": now - timedelta(hours=i),
+             "check_out": now - timedelta(hours=i) + timedelta(hours=6), "auto_closed": False,
+             "created_at": now}
+            for i in range(rows)
+        ])
+
+
+def hammer_database(role: str, rows: int, seconds: float) -> dict:
+    """One writer ("write") or reader ("read") process on the raw engine; per-operation timings."""
+    from sqlalchemy import text
+    from app.db.database import engine
+
+    engine.echo = False
+    rng = random.Random(os.getpid())
+    update = text("UPDATE members SET address = :address WHERE id = :id")
+    lookup = text("SELECT name, phone, address FROM members WHERE id = :id")
+    timings = []
+    deadline = time.perf_counter() + seconds
+    with engine.connect() as conn:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if role == "write":
+                conn.execute(update, {"address": f"Street {rng.random()}", "id": rng.randint(1, rows)})
+            else:
+                conn.execute(lookup, {"id": rng.randint(1, rows)}).all()
+            conn.commit()
+            timings.append(time.perf_counter() - start)
+    return {"timings": timings}
+
+
+async def drive(rows: int, concurrency: int, seconds: float, worker: int) -> dict:
+    import httpx
+    from app.auth.jwt_handler import create_access_token
+    from app.db.database import async_engine, engine
+    from app.main import app
+
+    engine.echo = async_engine.echo = False
+    headers = {"Authorization": "Bearer " + create_access_token(1)}
+    weights = [weight for weight, *_ in MIX]
+    reads, writes, errors = [], [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(rng: random.Random):
+        nonlocal errors
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as http:
+            while time.perf_counter() < deadline:
+                _, method, path, is_write = rng.choices(MIX, weights)[0]
+                url = path.format(id=rng.randint(1, rows))
+                body = None
+                if method == "PUT":
+                    body = {"address": f"Street {rng.randint(1, 10 ** 6)}"}
+                elif method == "POST":
+                    n = rng.randint(1, 10 ** 9)
+                    body = {"name": f"walk-in {n}", "phone": f"7{n:09d}"}
+                start = time.perf_counter()
+                response = await http.request(method, url, json=body, headers=headers)
+                (writes if is_write else reads).append(time.perf_counter() - start)
+                if response.status_code >= 500:
+                    errors += 1
+
+    await asyncio.gather(*(client(random.Random(worker * 1000 + i)) for i in range(concurrency)))
+    await async_engine.dispose()
+    return {"reads": reads, "writes": writes, "errors": errors}
+
+
+def _run_children(env: dict, argv_list: list) -> list:
+    """Start one process per argv at once; their RESULT payloads."""
+    children = [
+        subprocess.Popen([sys.executable, __file__, *argv], env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for argv in argv_list
+    ]
+    results = []
+    for child in children:
+        out, _ = child.communicate()
+        line = next(l for l in out.splitlines() if l.startswith("RESULT "))
+        results.append(json.loads(line[len("RESULT "):]))
+    return results
+
+
+def run_profile(name: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, **PROFILES[name], DATABASE_URL=f"sqlite:///{tmp}/bench.db",
+                   ATTENDANCE_AUTOCLOSE_ENABLED="false")
+        subprocess.run([sys.executable, __file__, "--seed-only", "--rows", str(args.rows)],
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+        common = ["--rows", str(args.rows), "--seconds", str(args.seconds)]
+
+        roles = ["write"] + ["read"] * args.readers
+        database = _run_children(env, [["--database-child", role, *common] for role in roles])
+        results = {"database": (
+            [t for result in database[1:] for t in result["timings"]], database[0]["timings"],
+        )}
+
+        for workers in args.workers:
+            api = _run_children(env, [
+                ["--child", str(worker), "--concurrency", str(args.concurrency), *common]
+                for worker in range(workers)
+            ])
+            results[workers] = (
+                [t for result in api for t in result["reads"]],
+                [t for result in api for t in result["writes"]],
+                sum(result["errors"] for result in api),
+            )
+        return results
+
+
+def _p(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000 if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--readers", type=int, default=3, help="reader processes next to the writer (database part)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="API processes (api part)")
+    parser.add_argument("--concurrency", type=int, default=20, help="clients per API process")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--database-child", choices=["read", "write"], help=argparse.SUPPRESS)
+    parser.add_argument("--seed-only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed_only:
+        seed(args.rows)
+        return
+    if args.database_child:
+        print("RESULT " + json.dumps(hammer_database(args.database_child, args.rows, args.seconds)))
+        return
+    if args.child is not None:
+        result = asyncio.run(drive(args.rows, args.concurrency, args.seconds, args.child))
+        print("RESULT " + json.dumps(result))
+        return
+
+    results = {name: run_profile(name, args) for name in PROFILES}
+
+    print(f"\nDatabase, {args.rows} members, 1 writer + {args.readers} readers, {args.seconds:g} s\n")
+    print(f"{'profile':<9}{'writes/s':>10}{'reads/s':>10}{'write p50/p99 ms':>18}{'read p50/p99 ms':>17}")
+    for name in PROFILES:
+        reads, writes = results[name]["database"]
+        print(f"{name:<9}{len(writes) / args.seconds:>10.0f}{len(reads) / args.seconds:>10.0f}"
+              f"{f'{_p(writes, 0.5):.1f}/{_p(writes, 0.99):.1f}':>18}"
+              f"{f'{_p(reads, 0.5):.1f}/{_p(reads, 0.99):.1f}':>17}")
+
+    print(f"\nAPI, {args.concurrency} clients per worker, {args.seconds:g} s\n")
+    print(f"{'profile':<9}{'workers':>8}{'req/s':>8}{'writes/s':>10}"
+          f"{'read p50/p99 ms':>17}{'write p50/p99 ms':>18}{'errors':>8}")
+    for workers in args.workers:
+        for name in PROFILES:
+            reads, writes, errors = results[name][workers]
+            print(f"{name:<9}{workers:>8}{(len(reads) + len(writes)) / args.seconds:>8.0f}"
+                  f"{len(writes) / args.seconds:>10.0f}"
+                  f"{f'{_p(reads, 0.5):.0f}/{_p(reads, 0.99):.0f}':>17}"
+                  f"{f'{_p(writes, 0.5):.0f}/{_p(writes, 0.99):.0f}':>18}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
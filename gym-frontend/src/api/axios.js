@@ -34,6 +34,15 @@ const apiClient = axios.create({
   },
 });
 
+// crypto.randomUUID only exists on https/localhost; the LAN build is plain http
+const newIdempotencyKey = () =>
+  globalThis.crypto?.randomUUID?.() ??
+  `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+
+// After a write the API keeps our reads on the primary database for a few
+// seconds (X-Primary-Until); echoing it back makes every API worker honour it
+let primaryUntil = 0;
+
 // Request interceptor: Attach JWT token to all requests
 apiClient.interceptors.request.use(
   (config) => {
@@ -42,6 +51,14 @@ apiClient.interceptors.request.use(
     if (token) {
       config.headers['Authorization'] = `Bearer ${token}`;
     }
+    // A retried POST keeps its config, so it reuses this key and the API
+    // replays the first response instead of creating a duplicate
+    if (config.method === 'post' && !config.url?.startsWith('/auth') && !config.headers['Idempotency-Key']) {
+      config.headers['Idempotency-Key'] = newIdempotencyKey();
+    }
+    if (primaryUntil > Date.now() / 1000) {
+      config.headers['X-Primary-Until'] = String(primaryUntil);
+    }
     return config;
   },
   (error) => {
@@ -51,7 +68,13 @@ apiClient.interceptors.request.use(
 
 // Response interceptor: Handle 401 errors (token expiry)
 apiClient.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const until = Number(response.headers?.['x-primary-until']);
+    if (until > primaryUntil) {
+      primaryUntil = until;
+    }
+    return response;
+  },
   (error) => {
     if (error.response?.status === 401) {
       // Clear auth state
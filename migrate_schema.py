@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Database migration script for columns and indexes added after the initial schema.
+
+Base.metadata.create_all() only creates missing tables; it never alters an
+existing one. Run this once against an existing database to add whatever is
+listed below. Every step is skipped if it is already present, so it is safe
+to run repeatedly.
+"""
+
+import sys
+import os
+
+# Add the app directory to the path so we can import app modules
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import text, inspect
+from app.db.database import engine
+from app.core.config import DATABASE_URL
+
+# (table, column, DDL type) - added with ALTER TABLE ... ADD COLUMN
+COLUMNS = [
+    ("trainer_attendance", "auto_closed", "BOOLEAN NOT NULL DEFAULT 0"),
+    ("workouts", "client_id", "VARCHAR(64) NULL"),
+    ("members", "updated_at", "DATETIME NULL"),
+    ("members", "row_version", "INTEGER NOT NULL DEFAULT 1"),
+    ("trainer_profiles", "row_version", "INTEGER NOT NULL DEFAULT 1"),
+]
+
+# (table, index name, columns[, unique])
+INDEXES = [
+    ("trainer_attendance", "ix_trainer_attendance_trainer_check_in", ["trainer_id", "check_in"]),
+    ("trainer_attendance", "ix_trainer_attendance_check_in_id", ["check_in", "id"]),
+    ("workouts", "ix_workouts_user_date", ["user_id", "date"]),
+    ("workouts", "ix_workouts_user_created_at", ["user_id", "created_at"]),
+    ("workouts", "ix_workouts_user_updated_at", ["user_id", "updated_at"]),
+    ("workouts", "uq_workouts_user_client_id", ["user_id", "client_id"], True),
+    ("members", "ix_members_updated_at", ["updated_at"]),
+]
+
+
+def migrate():
+    """Add missing columns and indexes."""
+    try:
+        inspector = inspect(engine)
+        existing_tables = set(inspector.get_table_names())
+
+        with engine.connect() as connection:
+            for table, column, ddl_type in COLUMNS:
+                if table not in existing_tables:
+                    continue
+                columns = [col["name"] for col in inspector.get_columns(table)]
+                if column in columns:
+                    print(f"   ✅ {table}.{column} already exists")
+                    continue
+                print(f"   Adding {table}.{column}...")
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+            for table, index_name, index_columns, *unique in INDEXES:
+                if table not in existing_tables:
+                    continue
+                indexes = [idx["name"] for idx in inspector.get_indexes(table)]
+                indexes += [uc["name"] for uc in inspector.get_unique_constraints(table)]
+                if index_name in indexes:
+                    print(f"   ✅ {index_name} already exists")
+                    continue
+                print(f"   Creating {index_name}...")
+                kind = "UNIQUE INDEX" if unique and unique[0] else "INDEX"
+                connection.execute(text(
+                    f"CREATE {kind} {index_name} ON {table} ({', '.join(index_columns)})"
+                ))
+
+            connection.commit()
+
+        print("\n✨ Migration completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed with error:")
+        print(f"   {type(e).__name__}: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("DOJO Fitness - Database Migration")
+    print("Adding new columns and indexes")
+    print("=" * 60)
+    print(f"\nDatabase: {DATABASE_URL.split('@')[-1]}")
+
+    sys.exit(0 if migrate() else 1)
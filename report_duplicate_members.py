@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Report members that are probably the same person registered twice.
+
+members.phone is unique, but the same person still shows up twice with a
+slightly different spelling ("Mohammad Ali" / "Muhammad Ali") or with a new
+phone number. Comparing every member with every other one is O(n^2), so
+members are first grouped by blocking keys and only pairs that share a key
+are scored:
+
+    t:<abc>|<def>   first 3 letters of two name words (typos later in the
+                    words, swapped first/last name)
+    c:<skeleton>    consonants of the name, doubled letters and spaces
+                    squeezed out, as typed and with the words sorted (vowel
+                    and double-letter typos anywhere, "Maryann"/"Mary Ann")
+    p:<digits>      last 10 phone digits (same number typed with and without
+                    country code)
+
+A key shared by more than --max-block members (a very common name) is not
+compared all-pairs; its members are sorted by name and each is compared
+with the next --window ones instead.
+
+Each candidate pair gets a name similarity (difflib ratio of the normalized
+names, as typed or with the words sorted, whichever is higher) and a phone similarity (1 for the same number, 0.8
+for a one-digit typo). A pair is reported when the names are at least
+--name-threshold similar, or the phones match and the names are at least
+0.6 similar. Different genders or ages more than 2 years apart lower the
+score; pairs below --min-score are dropped. Blocks are scored in a
+process pool.
+
+The report is a CSV sorted by score, with a group column joining pairs
+that share a member (A~B and B~C are one group), for someone to review
+before merging anything. Nothing in the database is changed.
+
+Usage:
+    python report_duplicate_members.py [--out duplicate_members.csv] [--workers 4]
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.member_search import normalize_text, phone_digits
+
+NATIONAL_NUMBER_DIGITS = 10
+PREFIX_LETTERS = 3
+PHONE_MATCH_NAME_THRESHOLD = 0.6
+NON_CONSONANTS = str.maketrans("", "", "aeiouy ")
+DOUBLED = re.compile(r"(.)\1+")
+
+MAX_AGE_GAP = 2
+MISMATCH_PENALTY = 0.2
+
+# set in each worker by _init_worker: id -> (name, name with sorted words, national digits, gender, age)
+_docs = {}
+
+
+def blocking_keys(words, digits):
+    keys = set()
+    prefixes = sorted({word[:PREFIX_LETTERS] for word in words})
+    if len(prefixes) == 1:
+        keys.add("t:" + words[0])  # single-word name: the whole word
+    for a, b in combinations(prefixes, 2):
+        keys.add(f"t:{a}|{b}")
+    for ordered in (words, sorted(words)):
+        skeleton = DOUBLED.sub(r"\1", "".join(ordered)).translate(NON_CONSONANTS)
+        if skeleton:
+            keys.add("c:" + skeleton)
+    if len(digits) >= 7:
+        keys.add("p:" + digits[-NATIONAL_NUMBER_DIGITS:])
+    return keys
+
+
+def phone_similarity(a: str, b: str) -> float:
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    if len(a) == len(b) and sum(x != y for x, y in zip(a, b)) == 1:
+        return 0.8
+    return 0.0
+
+
+def _similarity(matcher, a, b, needed):
+    """difflib ratio, or 0 as soon as the cheap upper bounds rule out needed."""
+    matcher.set_seqs(a, b)
+    if matcher.real_quick_ratio() < needed or matcher.quick_ratio() < needed:
+        return 0.0
+    return matcher.ratio()
+
+
+def _init_worker(docs):
+    global _docs
+    _docs = docs
+
+
+def _score_blocks(blocks, name_threshold, window, min_score):
+    """Score the candidate pairs of a batch of blocks; [(a, b, score, name_sim, phone_sim)]."""
+    seen = set()
+    results = []
+    matcher = SequenceMatcher(autojunk=False)
+    for ids, large in blocks:
+        if large:
+            ids = sorted(ids, key=lambda member_id: _docs[member_id][1])
+            pairs = ((ids[i], ids[j]) for i in range(len(ids)) for j in range(i + 1, min(i + 1 + window, len(ids))))
+        else:
+            pairs = combinations(ids, 2)
+        for a, b in pairs:
+            pair = (a, b) if a < b else (b, a)
+            if pair in seen:
+                continue
+            seen.add(pair)
+            name_a, sorted_a, digits_a, gender_a, age_a = _docs[pair[0]]
+            name_b, sorted_b, digits_b, gender_b, age_b = _docs[pair[1]]
+            phone_sim = phone_similarity(digits_a, digits_b)
+            needed = PHONE_MATCH_NAME_THRESHOLD if phone_sim else name_threshold
+            name_sim = _similarity(matcher, name_a, name_b, needed)
+            if name_sim < needed and sorted_a != name_a:
+                name_sim = max(name_sim, _similarity(matcher, sorted_a, sorted_b, needed))
+            if name_sim < needed:
+                continue
+            score = 0.7 * name_sim + 0.3 * phone_sim
+            if gender_a and gender_b and gender_a != gender_b:
+                score -= MISMATCH_PENALTY
+            if age_a and age_b and abs(age_a - age_b) > MAX_AGE_GAP:
+                score -= MISMATCH_PENALTY
+            if score < min_score:
+                continue
+            results.append((pair[0], pair[1], round(score, 3), round(name_sim, 3), phone_sim))
+    return results
+
+
+def find_duplicates(rows, workers=4, name_threshold=0.9, min_score=0.6, max_block=200, window=20,
+                    batch_pairs=200_000):
+    """
+    rows: (id, name, phone, gender, age) tuples.
+    Returns [(a, b, score, name_sim, phone_sim)] best first and block stats.
+    """
+    docs = {}
+    blocks = defaultdict(list)
+    for member_id, name, phone, gender, age in rows:
+        words = normalize_text(name).split()
+        digits = phone_digits(phone)[-NATIONAL_NUMBER_DIGITS:]
+        if not words:
+            continue
+        docs[member_id] = (" ".join(words), " ".join(sorted(words)), digits, (gender or "").strip().lower()[:1], age)
+        for key in blocking_keys(words, digits):
+            blocks[key].append(member_id)
+
+    # batch blocks into tasks of roughly batch_pairs comparisons each
+    tasks, batch, batch_cost = [], [], 0
+    stats = {"members": len(docs), "blocks": 0, "large_blocks": 0, "comparisons": 0}
+    for ids in blocks.values():
+        if len(ids) < 2:
+            continue
+        large = len(ids) > max_block
+        cost = len(ids) * window if large else len(ids) * (len(ids) - 1) // 2
+        stats["blocks"] += 1
+        stats["large_blocks"] += large
+        stats["comparisons"] += cost
+        batch.append((ids, large))
+        batch_cost += cost
+        if batch_cost >= batch_pairs:
+            tasks.append(batch)
+            batch, batch_cost = [], 0
+    if batch:
+        tasks.append(batch)
+
+    best = {}
+    if workers <= 1:
+        _init_worker(docs)
+        chunks = [_score_blocks(task, name_threshold, window, min_score) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(docs,)) as pool:
+            futures = [pool.submit(_score_blocks, task, name_threshold, window, min_score) for task in tasks]
+            chunks = [future.result() for future in futures]
+    for chunk in chunks:
+        for result in chunk:
+            best[result[:2]] = result  # same pair from another block scores the same
+    return sorted(best.values(), key=lambda r: (-r[2], r[0], r[1])), stats
+
+
+def group_pairs(pairs):
+    """Union-find over the pairs: member id -> group number."""
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b, *_ in pairs:
+        parent[find(a)] = find(b)
+    groups = {}
+    for a, b, *_ in pairs:
+        groups.setdefault(find(a), len(groups) + 1)
+    return {member_id: groups[find(member_id)] for member_id in parent}
+
+
+def write_report(path, pairs, members):
+    groups = group_pairs(pairs)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["group", "score", "name_similarity", "phone_similarity",
+                         "id_a", "name_a", "phone_a", "created_a",
+                         "id_b", "name_b", "phone_b", "created_b"])
+        for a, b, score, name_sim, phone_sim in pairs:
+            writer.writerow([groups[a], score, name_sim, phone_sim,
+                             a, *members[a], b, *members[b]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default="duplicate_members.csv")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--name-threshold", type=float, default=0.9)
+    parser.add_argument("--min-score", type=float, default=0.6)
+    parser.add_argument("--max-block", type=int, default=200)
+    parser.add_argument("--window", type=int, default=20)
+    args = parser.parse_args()
+
+    from app.db.database import SessionLocal, engine
+    from app.models.members import Member
+
+    engine.echo = False
+    start = time.perf_counter()
+    with SessionLocal() as db:
+        rows = db.query(Member.id, Member.name, Member.phone, Member.gender, Member.age,
+                         Member.created_at).all()
+    members = {member_id: (name, phone, created_at) for member_id, name, phone, _, _, created_at in rows}
+    loaded = time.perf_counter()
+
+    pairs, stats = find_duplicates(
+        [row[:5] for row in rows],
+        workers=args.workers, name_threshold=args.name_threshold, min_score=args.min_score,
+        max_block=args.max_block, window=args.window,
+    )
+    write_report(args.out, pairs, members)
+    done = time.perf_counter()
+
+    print(f"{stats['members']} members, {stats['blocks']} blocks ({stats['large_blocks']} windowed), "
+          f"{stats['comparisons']} comparisons")
+    print(f"{len(pairs)} likely duplicate pairs written to {args.out}")
+    print(f"load {loaded - start:.1f}s, match {done - loaded:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Shared fixtures. The app runs against a throwaway SQLite file: settings are
+read at import time, so the environment is set before anything from app/
+is imported.
+
+Run with `python -m pytest tests` (needs pytest and httpx).
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+_tmp = tempfile.mkdtemp(prefix="dojo-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ.setdefault("ATTENDANCE_AUTOCLOSE_ENABLED", "false")
+os.environ.setdefault("READ_REPLICA_URLS", "")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth.jwt_handler import create_access_token
+from app.db.database import SessionLocal, async_engine, engine
+from app.main import app
+from app.models.user import User
+
+engine.echo = async_engine.echo = False
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:  # lifespan creates the tables
+        yield client
+
+
+def make_user(role: str = "admin") -> User:
+    db = SessionLocal()
+    try:
+        count = db.query(User).count()
+        user = User(name=f"{role} {count}", email=f"{role}{count}@test.local", password_hash="x",
+                    role=role, status="approved", created_at=datetime.now(timezone.utc))
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        db.expunge(user)
+        return user
+    finally:
+        db.close()
+
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": "Bearer " + create_access_token(user.id)}
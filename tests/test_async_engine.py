@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.db.database import async_database_url
+from app.db.replicas import Replica
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_unknown_dialect_has_no_async_url():
+    assert async_database_url("postgresql://user:pw@db/dojo") is None
+    assert async_database_url("mysql+pymysql://user:pw@db/dojo") == "mysql+aiomysql://user:pw@db/dojo"
+
+
+def test_replica_without_async_driver(tmp_path):
+    replica = Replica(f"sqlite:///{tmp_path}/r.db", None, echo=False)
+    try:
+        assert replica.async_engine is None
+    finally:
+        replica.engine.dispose()
+
+
+def test_postgresql_url_imports():
+    pytest.importorskip("psycopg2")
+    env = dict(os.environ, DATABASE_URL="postgresql://user:pw@localhost/dojo", READ_REPLICA_URLS="")
+    result = subprocess.run(
+        [sys.executable, "-c", "from app.db.database import async_engine; assert async_engine is None"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,52 @@
+import asyncio
+
+from pydantic import BaseModel, ConfigDict
+
+from conftest import auth_headers, make_user
+
+from app.db.database import SessionLocal
+from app.models.user import User
+from app.utils.coalesce import coalesce
+
+
+class UserOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    name: str
+    role: str
+
+
+def test_shared_result_holds_no_orm_rows(client):
+    user = make_user("admin")
+    sessions = []
+
+    @coalesce(list[UserOut], ttl=60, name="test.users")
+    def list_users(user_id: int):
+        db = SessionLocal()
+        sessions.append(db)
+        return db.query(User).filter(User.id == user_id).all()
+
+    async def requests():
+        first, second = await asyncio.gather(list_users(user_id=user.id), list_users(user_id=user.id))
+        for db in sessions:
+            db.close()  # the leader's dependency teardown
+        cached = await list_users(user_id=user.id)
+        return first, second, cached
+
+    first, second, cached = asyncio.run(requests())
+
+    assert len(sessions) == 1
+    for result in (first, second, cached):
+        assert result == [UserOut.model_validate(user).model_dump()]
+        assert not isinstance(result[0], User)
+    assert list_users.single_flight.stats["cache_hits"] == 1
+
+
+def test_coalesced_route(client):
+    headers = auth_headers(make_user("admin"))
+    client.post("/members/", headers=headers, json={"name": "Ravi", "phone": "9000000002"})
+
+    members = client.get("/members/", headers=headers)
+
+    assert members.status_code == 200
+    assert "Ravi" in [member["name"] for member in members.json()]
@@ -0,0 +1,51 @@
+"""
+The hot reads: principal lookup, member, plan and trainer-attendance reads.
+"""
+
+from conftest import auth_headers, make_user
+
+
+def test_principal_and_roles(client):
+    admin, trainer = make_user("admin"), make_user("trainer")
+
+    me = client.get("/auth/me", headers=auth_headers(admin))
+    assert me.status_code == 200 and me.json()["id"] == admin.id
+    assert client.get("/trainer-attendance/", headers=auth_headers(trainer)).status_code == 403
+    assert client.get("/auth/me", headers={"Authorization": "Bearer nope"}).status_code == 401
+
+
+def test_plans(client):
+    headers = auth_headers(make_user("admin"))
+    created = client.post("/plans/", headers=headers, json={
+        "name": "monthly", "price": 1000, "discount": 10, "duration_days": 30,
+    }).json()
+
+    assert created["id"] in [plan["id"] for plan in client.get("/plans/", headers=headers).json()]
+    assert client.get(f"/plans/{created['id']}", headers=headers).json()["final_price"] == 900
+    assert client.get("/plans/999999", headers=headers).status_code == 404
+
+
+def test_member_list_and_detail(client):
+    headers = auth_headers(make_user("admin"))
+    created = client.post("/members/", headers=headers, json={"name": "Asha", "phone": "9000000001"}).json()
+
+    assert created["id"] in [member["id"] for member in client.get("/members/", headers=headers).json()]
+    detail = client.get(f"/members/{created['id']}", headers=headers)
+    assert detail.status_code == 200 and detail.json()["name"] == "Asha"
+    assert client.get(f"/members/{created['id']}", headers={
+        **headers, "If-None-Match": detail.headers["etag"],
+    }).status_code == 304
+    assert client.get("/members/999999", headers=headers).status_code == 404
+
+
+def test_attendance_reads(client):
+    admin, trainer = make_user("admin"), make_user("trainer")
+    headers = auth_headers(admin)
+    client.post("/trainer-attendance/batch", headers=headers,
+                json={"entries": [{"trainer_id": trainer.id, "action": "checkin"}]})
+
+    page = client.get("/trainer-attendance/?limit=1", headers=headers).json()
+    assert page["items"][0]["trainer_id"] == trainer.id
+    assert trainer.id in [row["trainer_id"] for row in client.get("/trainer-attendance/today", headers=headers).json()]
+    mine = client.get("/trainer-attendance/me", headers=auth_headers(trainer)).json()
+    assert [row["trainer_id"] for row in mine["items"]] == [trainer.id]
@@ -0,0 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils import images
+
+
+def test_concurrent_first_uploads_share_one_pool():
+    try:
+        with ThreadPoolExecutor(max_workers=8) as threads:
+            pools = list(threads.map(lambda _: images.get_image_pool(1), range(8)))
+        assert len({id(pool) for pool in pools}) == 1
+    finally:
+        images.shutdown_image_pool()
@@ -0,0 +1,80 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from conftest import auth_headers, make_user
+
+from app.core.read_routing import ReadRoutingMiddleware
+from app.db.database import async_database_url, engine, get_async_db, get_db
+from app.db.replicas import ReplicaSet
+
+WHICH = text("SELECT name FROM which_db")
+
+
+def _label(url: str, name: str):
+    label_engine = create_engine(url)
+    with label_engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS which_db"))
+        conn.execute(text("CREATE TABLE which_db (name TEXT)"))
+        conn.execute(text("INSERT INTO which_db VALUES (:name)"), {"name": name})
+    label_engine.dispose()
+
+
+@pytest.fixture
+def routed(tmp_path):
+    urls = [f"sqlite:///{tmp_path}/r1.db", f"sqlite:///{tmp_path}/r2.db"]
+    for url, name in zip(urls, ("r1", "r2")):
+        _label(url, name)
+    _label(str(engine.url), "primary")
+    replicas = ReplicaSet(urls, async_url=async_database_url, max_lag_seconds=30)
+
+    async def principal(db: AsyncSession = Depends(get_async_db)):
+        # stands in for get_current_user's lookup on the async path
+        return (await db.execute(WHICH)).scalar()
+
+    app = FastAPI()
+
+    @app.get("/which")
+    def which(principal_db: str = Depends(principal), db: Session = Depends(get_db)):
+        return {"principal": principal_db, "endpoint": db.execute(WHICH).scalar()}
+
+    @app.post("/write")
+    def write():
+        return {}
+
+    app.add_middleware(ReadRoutingMiddleware, replicas=replicas, sticky_seconds=60)
+    with TestClient(app) as client:
+        yield client, replicas
+    for replica in replicas.replicas:
+        replica.engine.dispose()
+
+
+def test_one_replica_per_request_alternating(routed):
+    client, _ = routed
+    headers = auth_headers(make_user("admin"))
+
+    seen = [client.get("/which", headers=headers).json() for _ in range(4)]
+
+    assert [s["endpoint"] for s in seen] == ["r1", "r2", "r1", "r2"]
+    assert all(s["principal"] == s["endpoint"] for s in seen)
+
+
+def test_unhealthy_replica_is_skipped(routed):
+    client, replicas = routed
+    replicas.replicas[0].healthy = False
+
+    assert {client.get("/which").json()["endpoint"] for _ in range(3)} == {"r2"}
+
+
+def test_reads_stay_on_primary_after_a_write(routed):
+    client, _ = routed
+    writer, other = auth_headers(make_user("admin")), auth_headers(make_user("admin"))
+
+    write = client.post("/write", headers=writer)
+
+    assert "x-primary-until" in write.headers
+    assert client.get("/which", headers=writer).json() == {"principal": "primary", "endpoint": "primary"}
+    assert client.get("/which", headers=other).json()["endpoint"] in {"r1", "r2"}
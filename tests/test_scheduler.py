@@ -0,0 +1,19 @@
+import asyncio
+
+from app.core.scheduler import Scheduler
+
+
+def test_restart_does_not_duplicate_jobs():
+    started = []
+
+    async def lifespan_cycle(scheduler):
+        scheduler.add_job(lambda: None, 60, name="tick")
+        scheduler.start()
+        started.append(len(scheduler._tasks))
+        await scheduler.stop()
+
+    scheduler = Scheduler()
+    asyncio.run(lifespan_cycle(scheduler))
+    asyncio.run(lifespan_cycle(scheduler))
+
+    assert started == [1, 1]
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.static_files import IMMUTABLE_CACHE_CONTROL, CacheControlledStaticFiles
+
+CONTENT_HASH = "0123456789abcdef0123456789abcdef"
+PHOTO = bytes(range(256)) * 8
+
+
+@pytest.fixture
+def uploads(tmp_path):
+    root = tmp_path / "uploads"
+    (root / "members" / "01" / "23").mkdir(parents=True)
+    (root / "members" / "01" / "23" / f"{CONTENT_HASH}_thumb.webp").write_bytes(PHOTO)
+    (root / "member_7.png").write_bytes(PHOTO)
+    app = FastAPI()
+    app.mount("/uploads", CacheControlledStaticFiles(directory=str(root), cache_dir=str(tmp_path / "cache")))
+    return root, TestClient(app)
+
+
+def test_hashed_name_is_immutable(uploads):
+    _, client = uploads
+    response = client.get(f"/uploads/members/01/23/{CONTENT_HASH}_thumb.webp")
+
+    assert response.status_code == 200
+    assert response.content == PHOTO
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["etag"] == f'"{CONTENT_HASH}"'
+
+
+def test_if_none_match_gets_304(uploads):
+    _, client = uploads
+    url = f"/uploads/members/01/23/{CONTENT_HASH}_thumb.webp"
+    response = client.get(url, headers={"If-None-Match": f'"{CONTENT_HASH}"'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == f'"{CONTENT_HASH}"'
+
+
+def test_range_request(uploads):
+    _, client = uploads
+    response = client.get(f"/uploads/members/01/23/{CONTENT_HASH}_thumb.webp", headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == PHOTO[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(PHOTO)}"
+
+
+def test_legacy_file_revalidates_on_its_bytes(uploads):
+    root, client = uploads
+    first = client.get("/uploads/member_7.png")
+    assert first.headers["cache-control"] == "no-cache"
+    etag = first.headers["etag"]
+    assert client.get("/uploads/member_7.png", headers={"If-None-Match": etag}).status_code == 304
+
+    # overwritten in place: new bytes, new ETag
+    (root / "member_7.png").write_bytes(PHOTO[::-1])
+    stat = os.stat(root / "member_7.png")
+    os.utime(root / "member_7.png", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = client.get("/uploads/member_7.png", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
@@ -0,0 +1,38 @@
+import pytest
+
+from app.db.database import SessionLocal
+from app.models.storage import StoredObject
+from app.storage import release
+
+
+@pytest.fixture
+def db(client):  # client: the lifespan has created the tables
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+
+
+def _refcounts(db, keys):
+    return dict(db.query(StoredObject.key, StoredObject.refcount).filter(StoredObject.key.in_(keys)).all())
+
+
+def test_shared_photo_loses_one_reference_per_member(db):
+    db.add_all([StoredObject(key="shared", refcount=2), StoredObject(key="kept", refcount=3)])
+    db.flush()
+
+    orphaned = release(db, ["shared", "kept", "shared", "kept"])
+
+    assert orphaned == ["shared"]
+    assert _refcounts(db, ["shared", "kept"]) == {"kept": 1}
+
+
+def test_release_in_chunks(db):
+    keys = [f"k{i}" for i in range(7)]
+    db.add_all([StoredObject(key=key, refcount=1 + i % 2) for i, key in enumerate(keys)])
+    db.flush()
+
+    orphaned = release(db, keys + ["legacy"], chunk_size=2)
+
+    assert orphaned == keys[0::2] + ["legacy"]
+    assert _refcounts(db, keys) == {key: 1 for key in keys[1::2]}
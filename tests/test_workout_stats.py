@@ -0,0 +1,19 @@
+from conftest import auth_headers, make_user
+
+
+def test_stats_route_is_not_shadowed_by_workout_id(client):
+    user = make_user("member")
+    headers = auth_headers(user)
+    for day, duration in (("2026-03-02", 30), ("2026-03-03", 45), ("2026-03-10", 60)):
+        client.post("/workouts/", headers=headers, json={"name": "run", "date": day, "duration": duration})
+
+    response = client.get("/workouts/stats?granularity=week&from=2026-03-01&to=2026-03-31", headers=headers)
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total_workouts"] == 3
+    assert stats["total_duration"] == 135
+    assert [(b["period_start"], b["workouts"]) for b in stats["buckets"]] == [
+        ("2026-03-02", 2), ("2026-03-09", 1),
+    ]
+    assert stats["longest_workout"]["value"] == 60
@@ -0,0 +1,38 @@
+from conftest import auth_headers, make_user
+
+from app.db.database import SessionLocal
+from app.models.workout import Workout, WorkoutTombstone
+
+
+def test_create_then_delete_in_one_batch(client):
+    user = make_user("member")
+    response = client.post("/workouts/sync", headers=auth_headers(user), json={"changes": [
+        {"client_id": "c1", "name": "a"},
+        {"client_id": "c1", "deleted": True},
+    ]})
+
+    assert response.status_code == 200
+    assert [(a["client_id"], a["status"]) for a in response.json()["applied"]] == [
+        ("c1", "created"), ("c1", "deleted"),
+    ]
+    db = SessionLocal()
+    try:
+        # never written, so no row and no tombstone
+        assert db.query(Workout).filter(Workout.user_id == user.id).count() == 0
+        assert db.query(WorkoutTombstone).filter(WorkoutTombstone.user_id == user.id).count() == 0
+    finally:
+        db.close()
+
+
+def test_delete_leaves_tombstone(client):
+    user = make_user("member")
+    headers = auth_headers(user)
+    created = client.post("/workouts/sync", headers=headers,
+                          json={"changes": [{"client_id": "c2", "name": "b"}]}).json()["applied"][0]
+
+    response = client.post("/workouts/sync", headers=headers,
+                           json={"changes": [{"client_id": "c2", "deleted": True}], "since": "2000-01-01T00:00:00"})
+
+    assert response.status_code == 200
+    assert response.json()["applied"] == [{"client_id": "c2", "id": created["id"], "status": "deleted"}]
+    assert [(d["id"], d["client_id"]) for d in response.json()["deleted"]] == [(created["id"], "c2")]